@@ -0,0 +1,101 @@
+# Memory and throughput benchmark: lap times in Python lists (the original
+# Driver) against the array('d') buffers Driver uses now.
+# Stores N generated laps over a grid of drivers, then measures the memory
+# held by the lap storage (tracemalloc), the time to add the laps, and the
+# time for the summary statistics: best, mean, median and 90th percentile
+# per driver plus the overall average.
+#
+# Usage: python bench_lap_storage.py [--laps N] [--drivers N]
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from typing import List
+
+import timing_board
+from timing_board import TimingBoard
+
+class ListDriver:
+    """The original Driver: a list of float objects and min() per lap."""
+
+    def __init__(self, code: str):
+        self.code = code
+        self.lap_times: List[float] = []
+        self.fastest_lap = float('inf')
+
+# Both ingest paths parse the lap lines, so each lap's float is created
+# here and it is the storage that decides whether it is kept
+def list_ingest(lines):
+    drivers = {}
+    for line in lines:
+        code, lap_time = line[:3], float(line[3:])
+        if code not in drivers:
+            drivers[code] = ListDriver(code)
+        driver = drivers[code]
+        driver.lap_times.append(lap_time)
+        driver.fastest_lap = min(driver.fastest_lap, lap_time)
+    return drivers
+
+def list_stats(drivers):
+    # As display_results did: mean() of each list and of a flattened copy
+    all_times = [time for driver in drivers.values() for time in driver.lap_times]
+    overall = statistics.mean(all_times)
+    rows = [(driver.fastest_lap, statistics.mean(driver.lap_times), statistics.median(driver.lap_times),
+             statistics.quantiles(driver.lap_times, n=10, method='inclusive')[-1])
+            for driver in drivers.values()]
+    return overall, rows
+
+def array_ingest(lines):
+    board = TimingBoard()
+    for line in lines:
+        board.add_lap(line[:3], float(line[3:]))
+    return board
+
+def array_stats(board):
+    rows = [(driver.fastest_lap, driver.average_lap, driver.median_lap(), driver.percentile(0.9))
+            for driver in board.drivers.values()]
+    return board.overall_average(), rows
+
+def measure(ingest, stats, lines):
+    # Memory and speed from separate runs: tracemalloc slows allocation
+    tracemalloc.start()
+    result = ingest(lines)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    start = time.perf_counter()
+    result = ingest(lines)
+    ingest_time = time.perf_counter() - start
+    start = time.perf_counter()
+    overall, rows = stats(result)
+    return memory, ingest_time, time.perf_counter() - start, overall, rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Lap storage benchmark")
+    parser.add_argument("--laps", type=int, default=1_000_000)
+    parser.add_argument("--drivers", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    codes = [f"D{i:02d}" for i in range(args.drivers)]
+    lines = [f"{rng.choice(codes)}{rng.gauss(90, 1.5):.3f}" for _ in range(args.laps)]
+
+    print(f"Laps: {args.laps}  Drivers: {args.drivers}  NumPy: {'yes' if timing_board.np else 'no'}")
+    print("Ingest includes parsing each line and, for array, the running totals and leaderboard")
+    print(f"{'Storage':<10}{'Memory (MB)':<14}{'Bytes/lap':<12}{'Ingest (s)':<13}{'Laps/s':<12}{'Stats (s)':<10}")
+    results = {}
+    for name, ingest, stats in [("list", list_ingest, list_stats), ("array", array_ingest, array_stats)]:
+        memory, ingest_time, stats_time, overall, rows = measure(ingest, stats, lines)
+        results[name] = (overall, rows)
+        print(f"{name:<10}{memory / 1e6:<14.1f}{memory / args.laps:<12.1f}{ingest_time:<13.3f}"
+              f"{args.laps / ingest_time:<12.0f}{stats_time:<10.3f}")
+
+    (old_overall, old_rows), (new_overall, new_rows) = results["list"], results["array"]
+    if abs(old_overall - new_overall) > 1e-6 or any(
+            abs(a - b) > 1e-6 for old, new in zip(old_rows, new_rows) for a, b in zip(old, new)):
+        raise SystemExit("FAIL: statistics differ between the two storages")
+    print("OK: same statistics from both")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Throughput benchmark: the line-by-line lap file parser against the bulk
+# block parser (process_timing_file(..., bulk=True)).
+# Generates a lap file (10M lines by default, a few of them malformed),
+# parses it both ways, and checks that both give the same laps, best laps,
+# averages, leaderboard and warnings, and that the bulk parser is faster.
+# The "fixed" layout writes every time with three decimals, so every line
+# of a block has the same width; the "variable" layout drops trailing
+# zeros, so the bulk parser has to pad each line to the longest.
+# Before timing, both parsers are run over many small random files of
+# valid, malformed, short and tied lines, in small blocks, and must agree.
+#
+# Usage: python bench_parser.py [--lines N] [--bad-every N] [--file PATH]
+#                               [--layout fixed|variable|both]
+import argparse
+import io
+import os
+import random
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from timing_board import TimingBoard
+
+CODES = ["HAM", "VER", "LEC", "SAI", "BOT", "NOR", "PER", "RUS", "ALO", "OCO",
+         "GAS", "STR", "TSU", "ALB", "ZHO", "MAG", "HUL", "PIA", "SAR", "RIC"]
+
+# Edge cases for the differential check: a bad line repeated after
+# another driver's, and a tie with a driver whose first line is no lap
+EDGE_CASES = ["AAAx\nBBBy\nAAAx\n", "BBB\nAAA9\nBBB9\n"]
+
+def format_time(lap_time, layout):
+    text = f"{lap_time:.3f}"
+    return text if layout == "fixed" else text.rstrip("0").rstrip(".")
+
+def write_lap_file(path, lines, bad_every, layout="fixed", seed=1):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("Silverstone\n")
+        batch = []
+        for i in range(1, lines + 1):
+            code = rng.choice(CODES)
+            if bad_every and i % bad_every == 0:
+                batch.append(f"{code}9x.{i % 1000:03d}")  # a malformed time
+            else:
+                batch.append(code + format_time(rng.gauss(90, 1.5), layout))
+            if len(batch) == 100_000:
+                f.write("\n".join(batch) + "\n")
+                batch = []
+        if batch:
+            f.write("\n".join(batch) + "\n")
+
+def parse(path, bulk):
+    board = TimingBoard()
+    output = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(output):
+        board.process_timing_file(path, bulk=bulk)
+    return time.perf_counter() - start, board, output.getvalue()
+
+def summary(board):
+    return {code: (driver.lap_count, driver.fastest_lap, round(driver.average_lap, 6))
+            for code, driver in board.drivers.items()}
+
+def random_laps(rng):
+    """A short lap file body mixing widths, ties, bad and short lines."""
+    lines = []
+    for _ in range(rng.randint(1, 60)):
+        code = rng.choice(CODES[:4])
+        kind = rng.random()
+        if kind < 0.1:
+            lines.append(code + rng.choice(["x", "9x.1", ".", "--1"]))
+        elif kind < 0.15:
+            lines.append(rng.choice(["", code, code[:2], "   "]))
+        elif kind < 0.17:
+            lines.append(" " + code + "90")  # indented: the block goes line by line
+        else:
+            lines.append(code + rng.choice(["9", "89.5", "90", "90.0", "90.25", "100.125", "91"]))
+    return "\n".join(lines) + "\n"
+
+def check_parsers_agree(files, seed=1):
+    """Exit if the parsers disagree on an edge case or a random file;
+    the bulk blocks are a few lines long, so many files span several."""
+    rng = random.Random(seed)
+    texts = EDGE_CASES + [random_laps(rng) for _ in range(files)]
+    for text in texts:
+        results = []
+        for bulk in (False, True):
+            board = TimingBoard()
+            output = io.StringIO()
+            with redirect_stdout(output):
+                if bulk:
+                    board.process_blocks(io.StringIO(text), block_size=rng.randint(1, 40))
+                else:
+                    board.process_lines(io.StringIO(text))
+            results.append((summary(board), list(board.leaderboard), output.getvalue()))
+        if results[0] != results[1]:
+            raise SystemExit(f"FAIL: the parsers disagree on:\n{text}")
+    print(f"OK: the parsers agree on {len(texts)} small files")
+
+def main():
+    parser = argparse.ArgumentParser(description="Lap file parser benchmark")
+    parser.add_argument("--lines", type=int, default=10_000_000)
+    parser.add_argument("--bad-every", type=int, default=1_000_000,
+                        help="make every Nth line malformed (0 for none)")
+    parser.add_argument("--file", help="parse this file instead of generating one")
+    parser.add_argument("--layout", choices=["fixed", "variable", "both"], default="both",
+                        help="width of the generated lap times")
+    args = parser.parse_args()
+
+    check_parsers_agree(2000)
+    if args.file:
+        benchmark(args.file)
+        return
+    layouts = ["fixed", "variable"] if args.layout == "both" else [args.layout]
+    with tempfile.TemporaryDirectory() as directory:
+        for layout in layouts:
+            path = os.path.join(directory, f"laps_{layout}.txt")
+            start = time.perf_counter()
+            write_lap_file(path, args.lines, args.bad_every, layout)
+            print(f"\nGenerated {args.lines} {layout} width lines in {time.perf_counter() - start:.1f} s")
+            benchmark(path)
+
+def benchmark(path):
+    size = os.path.getsize(path)
+    line_time, line_board, line_warnings = parse(path, bulk=False)
+    bulk_time, bulk_board, bulk_warnings = parse(path, bulk=True)
+
+    laps = line_board.lap_count
+    print(f"Laps: {laps}  File: {size / 1e6:.0f} MB  Warnings: {line_warnings.count(chr(10))}")
+    print(f"{'Parser':<10}{'Time (s)':<12}{'Lines/s':<14}{'MB/s':<10}")
+    for name, elapsed in [("line", line_time), ("bulk", bulk_time)]:
+        print(f"{name:<10}{elapsed:<12.2f}{laps / elapsed:<14.0f}{size / 1e6 / elapsed:<10.1f}")
+    print(f"Speed-up: {line_time / bulk_time:.1f}x")
+
+    if summary(line_board) != summary(bulk_board) or list(line_board.leaderboard) != list(bulk_board.leaderboard):
+        raise SystemExit("FAIL: the parsers disagree on the laps")
+    if line_warnings != bulk_warnings:
+        raise SystemExit("FAIL: the parsers printed different warnings")
+    print("OK: same laps, leaderboard and warnings")
+    if bulk_time >= line_time:
+        raise SystemExit("FAIL: the bulk parser is not faster than the line parser")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import math
+from array import array
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from timing_board import Driver, TimingBoard, np, percentile
+
+# A lap slower than this multiple of the driver's median lap is a pit,
+# safety car or incident lap, as in the 107% rule
+SLOW_LAP_FACTOR = 1.07
+# Laps in a rolling pace window
+PACE_WINDOW = 5
+
+def _as_numpy(lap_times: Sequence[float]):
+    # A view of an array('d') buffer; a copy of anything else
+    if isinstance(lap_times, array):
+        return np.frombuffer(lap_times, dtype=np.float64)
+    return np.asarray(lap_times, dtype=np.float64)
+
+def rolling_pace(lap_times: Sequence[float], window: int = PACE_WINDOW) -> array:
+    """Mean lap time of every run of window consecutive laps.
+
+    One running sum over the laps: each step adds the lap entering the
+    window and takes off the one leaving it (a cumulative sum with NumPy).
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    if len(lap_times) < window:
+        return array('d')
+    if np is not None:
+        sums = np.concatenate(([0.0], np.cumsum(_as_numpy(lap_times))))
+        return array('d', ((sums[window:] - sums[:-window]) / window).tobytes())
+    total = math.fsum(lap_times[:window])
+    pace = array('d', [total / window])
+    for entering, leaving in zip(lap_times[window:], lap_times):
+        total += entering - leaving
+        pace.append(total / window)
+    return pace
+
+def slow_laps(lap_times: Sequence[float], factor: float = SLOW_LAP_FACTOR) -> List[int]:
+    """Indexes of the laps slower than factor times the median lap."""
+    if not len(lap_times):
+        return []
+    limit = percentile(lap_times, 0.5) * factor
+    if np is not None:
+        return np.flatnonzero(_as_numpy(lap_times) > limit).tolist()
+    return [i for i, lap_time in enumerate(lap_times) if lap_time > limit]
+
+def clean_laps(lap_times: Sequence[float], slow: Sequence[int]) -> array:
+    """The laps without the slow ones (indexes from slow_laps)."""
+    if not slow:
+        return array('d', lap_times)
+    if np is not None:
+        return array('d', np.delete(_as_numpy(lap_times), slow).tobytes())
+    skip = set(slow)
+    return array('d', (lap_time for i, lap_time in enumerate(lap_times) if i not in skip))
+
+def stints(lap_count: int, slow: Sequence[int]) -> List[Tuple[int, int]]:
+    """(first, end) lap ranges between slow laps, end exclusive.
+
+    The in-lap and out-lap of a pit stop are both slow, so they end one
+    stint together rather than leaving a one-lap stint between them.
+    """
+    ranges = []
+    start = 0
+    for i in list(slow) + [lap_count]:
+        if i > start:
+            ranges.append((start, i))
+        start = i + 1
+    return ranges
+
+def consistency(lap_times: Sequence[float]) -> float:
+    """Sample standard deviation of the laps, as statistics.stdev."""
+    laps = len(lap_times)
+    if laps < 2:
+        return float('nan')
+    if np is not None:
+        return float(np.std(_as_numpy(lap_times), ddof=1))
+    mean = math.fsum(lap_times) / laps
+    return math.sqrt(math.fsum((t - mean) ** 2 for t in lap_times) / (laps - 1))
+
+def gap_to_leader(lap_times: Dict[str, Sequence[float]]) -> Dict[str, array]:
+    """Each driver's race time gap to the leader after each of their laps.
+
+    The leader after lap n is whoever has the lowest total time over n
+    laps. Every driver's running total is taken once and folded into the
+    leader's times, so the work is one pass over all the laps.
+    """
+    totals = {}
+    for code, laps in lap_times.items():
+        if np is not None:
+            totals[code] = np.cumsum(_as_numpy(laps))
+        else:
+            totals[code] = array('d', accumulate(laps))
+    most_laps = max(map(len, totals.values()), default=0)
+
+    if np is not None:
+        leader = np.full(most_laps, math.inf)
+        for total in totals.values():
+            np.minimum(leader[:len(total)], total, out=leader[:len(total)])
+        return {code: array('d', (total - leader[:len(total)]).tobytes()) for code, total in totals.items()}
+
+    leader = array('d', [math.inf]) * most_laps
+    for total in totals.values():
+        for lap, race_time in enumerate(total):
+            if race_time < leader[lap]:
+                leader[lap] = race_time
+    return {code: array('d', map(float.__sub__, total, leader)) for code, total in totals.items()}
+
+def theoretical_best(sector_times: Sequence[Sequence[float]]) -> float:
+    """Sum of the driver's best time in each sector."""
+    if not sector_times or not all(len(sector) for sector in sector_times):
+        return float('nan')
+    return math.fsum(min(sector) for sector in sector_times)
+
+def load_sector_times(filename: str) -> Optional[Dict[str, List[array]]]:
+    """Sector times per driver from a file laid out like the lap files:
+    the location, then one "<CODE><sector 1>,<sector 2>,..." line a lap.
+
+    Returns each driver's times as one array per sector, or None if the
+    file cannot be read.
+    """
+    sectors: Dict[str, List[array]] = {}
+    try:
+        with open(filename, 'r') as f:
+            f.readline()  # the location
+            for line in f:
+                line = line.strip()
+                if len(line) < 4:
+                    continue
+                code = line[:3]
+                try:
+                    times = [float(time) for time in line[3:].split(',')]
+                except ValueError:
+                    print(f"Warning: Invalid sector time format for {code}")
+                    continue
+                driver = sectors.setdefault(code, [array('d') for _ in times])
+                if len(times) != len(driver):
+                    print(f"Warning: Expected {len(driver)} sector times for {code}, got {len(times)}")
+                    continue
+                for sector, time in zip(driver, times):
+                    sector.append(time)
+    except FileNotFoundError:
+        print(f"Error: File {filename} not found.")
+        return None
+    except Exception as e:
+        print(f"Error processing file: {e}")
+        return None
+    return sectors
+
+def _time(value: float) -> str:
+    # NaN (too few laps or no sector times) shows as a dash
+    return f"{value:.3f}" if value == value else "-"
+
+class DriverAnalysis:
+    """Pace, stints and consistency of one driver's laps."""
+
+    def __init__(self, driver: Driver, slow_lap_factor: float = SLOW_LAP_FACTOR, window: int = PACE_WINDOW):
+        self.driver = driver
+        self.slow_laps = slow_laps(driver.lap_times, slow_lap_factor)
+        self.stints = stints(driver.lap_count, self.slow_laps)
+        self.clean_laps = clean_laps(driver.lap_times, self.slow_laps)
+        self.pace = rolling_pace(driver.lap_times, window)
+        self.consistency = consistency(self.clean_laps)
+
+    @property
+    def clean_average(self) -> float:
+        return sum(self.clean_laps) / len(self.clean_laps) if self.clean_laps else float('nan')
+
+    @property
+    def best_pace(self) -> float:
+        """Fastest rolling window; NaN with fewer laps than the window."""
+        return min(self.pace) if self.pace else float('nan')
+
+class RaceAnalysis:
+    """Per-driver analysis and gaps to the leader for a parsed TimingBoard."""
+
+    def __init__(self, board: TimingBoard, sector_times: Optional[Dict[str, List[array]]] = None,
+                 slow_lap_factor: float = SLOW_LAP_FACTOR, window: int = PACE_WINDOW):
+        self.board = board
+        self.window = window
+        self.sector_times = sector_times or {}
+        self.drivers = {code: DriverAnalysis(driver, slow_lap_factor, window)
+                        for code, driver in board.drivers.items()}
+        self.gaps = gap_to_leader({code: driver.lap_times for code, driver in board.drivers.items()})
+        self.race_laps = max((driver.lap_count for driver in board.drivers.values()), default=0)
+
+    def theoretical_best(self, code: str) -> float:
+        """Best lap from the driver's best sectors; NaN without sector times."""
+        return theoretical_best(self.sector_times.get(code, []))
+
+    def race_gap(self, code: str) -> str:
+        """Race time behind the leader after the leader's laps, or how many
+        laps down a driver with fewer laps is; "-" for the leader."""
+        laps_down = self.race_laps - self.board.drivers[code].lap_count
+        if laps_down > 0:
+            return f"+{laps_down} lap{'s' if laps_down > 1 else ''}"
+        gaps = self.gaps[code]
+        return f"+{gaps[-1]:.3f}" if len(gaps) and gaps[-1] > 0 else "-"
+
+    def display_results(self) -> None:
+        """Display the analysis on the console, in leaderboard order."""
+        print(f"\nRace Analysis - {self.board.location}")
+        print("=" * 90)
+        if not self.drivers:
+            print("No timing data available.")
+            return
+
+        print(f"{'Driver':<15}{'Laps':<6}{'Stints':<8}{'Slow':<6}{'Clean Avg':<11}{'Std Dev':<9}"
+              f"{f'Best {self.window}-Lap':<13}{'Theo Best':<11}{'Race Gap':<9}")
+        print("=" * 90)
+        for code in self.board.leaderboard:
+            driver = self.board.drivers[code]
+            analysis = self.drivers[code]
+            print(f"{driver.name or code:<15}{driver.lap_count:<6}{len(analysis.stints):<8}"
+                  f"{len(analysis.slow_laps):<6}{_time(analysis.clean_average):<11}{_time(analysis.consistency):<9}"
+                  f"{_time(analysis.best_pace):<13}{_time(self.theoretical_best(code)):<11}{self.race_gap(code):<9}")
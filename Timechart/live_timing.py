@@ -0,0 +1,112 @@
+import queue
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional, TextIO
+
+from timing_board import TimingBoard
+
+POLL_INTERVAL = 0.2
+REFRESH_INTERVAL = 1.0
+
+def follow(f: TextIO, poll_interval: float = POLL_INTERVAL,
+           idle_timeout: Optional[float] = None) -> Iterator[Optional[str]]:
+    """Yield lines as they are appended to f, like tail -f.
+
+    Yields None whenever no new line has arrived yet, so the caller can
+    redraw in the meantime. Stops after idle_timeout seconds without a new
+    line, or never if it is None.
+    """
+    partial = ""
+    last_line = time.monotonic()
+    while True:
+        chunk = f.readline()
+        if chunk:
+            partial += chunk
+            if partial.endswith("\n"):  # otherwise the writer is mid-line
+                yield partial
+                partial = ""
+                last_line = time.monotonic()
+            continue
+        if idle_timeout is not None and time.monotonic() - last_line >= idle_timeout:
+            if partial:
+                yield partial
+            return
+        yield None
+        time.sleep(poll_interval)
+
+def read_lines(f: TextIO, poll_interval: float = POLL_INTERVAL) -> Iterator[Optional[str]]:
+    """Yield the lines of f (e.g. a pipe on stdin) until it ends.
+
+    The lines are read on a background thread. Like follow(), this yields
+    None when no line has arrived for poll_interval seconds, so the caller
+    can redraw while a blocking read waits for the writer.
+    """
+    lines: queue.Queue = queue.Queue()
+
+    def read():
+        for line in f:
+            lines.put(line)
+        lines.put(None)
+
+    threading.Thread(target=read, daemon=True).start()
+    while True:
+        try:
+            line = lines.get(timeout=poll_interval)
+        except queue.Empty:
+            yield None
+            continue
+        if line is None:
+            return
+        yield line
+
+class LiveTiming:
+    """Feeds lap lines into a TimingBoard and redraws the leaderboard,
+    at most once per refresh interval and only when something changed."""
+
+    def __init__(self, board: TimingBoard, refresh: float = REFRESH_INTERVAL, out: TextIO = sys.stdout):
+        self.board = board
+        self.refresh = refresh
+        self.out = out
+        self.previous_positions: Dict[str, int] = {}
+        self.last_draw = 0.0
+        self.changed = False
+
+    def run(self, lines: Iterable[Optional[str]]) -> None:
+        """Consume lines (the first one is the location) until they end."""
+        lines = iter(lines)
+        for line in lines:
+            if line is not None:
+                self.board.location = line.strip()
+                break
+        for line in lines:
+            if line is not None and self.board.process_line(line):
+                self.changed = True
+            if self.changed and time.monotonic() - self.last_draw >= self.refresh:
+                self.draw()
+        self.board.display_results()
+
+    def draw(self) -> None:
+        board = self.board
+        if self.out.isatty():
+            self.out.write("\033[H\033[J")  # clear the screen
+        self.out.write(f"Live timing - {board.location}  ({board.lap_count} laps)\n")
+        self.out.write(f"{'Pos':<5}{'':<4}{'Driver':<15}{'Best Lap':<10}{'Gap':<9}{'Avg Lap':<10}{'Laps':<5}\n")
+        leader_time = board.get_fastest_driver()[1]
+        positions = {}
+        for position, code in enumerate(board.leaderboard, 1):
+            driver = board.drivers[code]
+            positions[code] = position
+            gap = "" if position == 1 else f"+{driver.fastest_lap - leader_time:.3f}"
+            self.out.write(f"{position:<5}{_movement(self.previous_positions.get(code), position):<4}"
+                           f"{driver.name or code:<15}{driver.fastest_lap:<10.3f}{gap:<9}"
+                           f"{driver.average_lap:<10.3f}{driver.lap_count:<5}\n")
+        self.out.flush()
+        self.previous_positions = positions
+        self.last_draw = time.monotonic()
+        self.changed = False
+
+def _movement(before: Optional[int], now: int) -> str:
+    if before is None or before == now:
+        return ""
+    return f"+{before - now}" if now < before else f"-{now - before}"
@@ -1,21 +1,70 @@
+import argparse
 import sys
 from pathlib import Path
+from lap_analytics import RaceAnalysis, load_sector_times
+from live_timing import LiveTiming, follow, read_lines
+from season import Season, expand_lap_files
 from timing_board import TimingBoard
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <lap_file>")
-        return
+    parser = argparse.ArgumentParser(usage="python main.py <lap_file> [<lap_file> ...] [--follow]",
+                                     description="Formula 1 lap timing board")
+    parser.add_argument("lap_files", nargs="+", metavar="lap_file",
+                        help="lap times file, or - to read laps from stdin as they arrive. "
+                             "Several files (or a directory of lap_times_*.txt) give season standings")
+    parser.add_argument("--follow", action="store_true",
+                        help="keep reading as laps are appended to the file, like tail -f")
+    parser.add_argument("--idle-timeout", type=float,
+                        help="with --follow, stop after this many seconds without a new lap")
+    parser.add_argument("--refresh", type=float, default=1.0,
+                        help="seconds between leaderboard redraws in live mode")
+    parser.add_argument("--bulk", action="store_true",
+                        help="parse the file in large blocks (faster for big files, same results; "
+                             "always on for several files)")
+    parser.add_argument("--analytics", action="store_true",
+                        help="also show stints, consistency, rolling pace and gaps to the leader")
+    parser.add_argument("--sectors", metavar="SECTOR_FILE",
+                        help="sector times file for theoretical best laps (implies --analytics)")
+    parser.add_argument("--jobs", type=int,
+                        help="worker processes for several files (default: one per CPU)")
+    args = parser.parse_args()
 
-    timing_file = sys.argv[1]
     board = TimingBoard()
-    
+
     driver_details_file = "f1_drivers.txt"
     if Path(driver_details_file).exists():
         board.load_driver_details(driver_details_file)
 
-    if board.process_timing_file(timing_file):
+    timing_files = expand_lap_files(args.lap_files)
+    if len(timing_files) > 1 or Path(args.lap_files[0]).is_dir():
+        used = {"--follow": args.follow, "--analytics": args.analytics, "--sectors": args.sectors}
+        single_file_options = [option for option, value in used.items() if value]
+        if single_file_options:
+            parser.error(f"{', '.join(single_file_options)} cannot be used with several lap files")
+        season = Season(board.driver_details)
+        season.process_files(timing_files, args.jobs)
+        season.display_results()
+        return
+
+    timing_file = timing_files[0] if timing_files else args.lap_files[0]
+    if timing_file == "-":
+        try:
+            LiveTiming(board, args.refresh).run(read_lines(sys.stdin))
+        except KeyboardInterrupt:
+            board.display_results()
+    elif args.follow:
+        try:
+            with open(timing_file, 'r') as f:
+                LiveTiming(board, args.refresh).run(follow(f, idle_timeout=args.idle_timeout))
+        except FileNotFoundError:
+            print(f"Error: File {timing_file} not found.")
+        except KeyboardInterrupt:
+            board.display_results()
+    elif board.process_timing_file(timing_file, bulk=args.bulk):
         board.display_results()
+        if args.analytics or args.sectors:
+            sector_times = load_sector_times(args.sectors) if args.sectors else None
+            RaceAnalysis(board, sector_times).display_results()
 
 if __name__ == "__main__":
     main()
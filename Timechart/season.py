@@ -0,0 +1,170 @@
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from timing_board import TimingBoard
+
+# Points for positions 1-10 in each event, as in the F1 championship
+POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+
+class LapStats:
+    """Lap count, mean, spread and best lap, mergeable across files.
+
+    Two LapStats combine exactly (Chan et al.'s parallel variance update),
+    so each file can be summarised in its own process and only these few
+    numbers are sent back, never the lap lists.
+    """
+
+    def __init__(self, laps: int = 0, mean: float = 0.0, m2: float = 0.0, fastest_lap: float = float('inf')):
+        self.laps = laps
+        self.mean = mean
+        self.m2 = m2  # sum of squared differences from the mean
+        self.fastest_lap = fastest_lap
+
+    @classmethod
+    def from_times(cls, lap_times: Sequence[float]) -> "LapStats":
+        # Two passes over the buffer beat a Welford update per lap
+        laps = len(lap_times)
+        if not laps:
+            return cls()
+        mean = math.fsum(lap_times) / laps
+        return cls(laps, mean, math.fsum((t - mean) ** 2 for t in lap_times), min(lap_times))
+
+    def merge(self, other: "LapStats") -> "LapStats":
+        """The stats of both sets of laps together."""
+        laps = self.laps + other.laps
+        if not laps:
+            return LapStats()
+        delta = other.mean - self.mean
+        return LapStats(
+            laps,
+            self.mean + delta * other.laps / laps,
+            self.m2 + other.m2 + delta * delta * self.laps * other.laps / laps,
+            min(self.fastest_lap, other.fastest_lap),
+        )
+
+    @property
+    def total_time(self) -> float:
+        return self.mean * self.laps
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation, as statistics.stdev."""
+        return math.sqrt(self.m2 / (self.laps - 1)) if self.laps > 1 else 0.0
+
+class EventResult:
+    """One lap file, reduced to per-driver LapStats in leaderboard order."""
+
+    def __init__(self, filename: str, location: str, drivers: Dict[str, LapStats], warnings: str = ""):
+        self.filename = filename
+        self.location = location
+        self.drivers = drivers
+        self.warnings = warnings
+
+    def standings(self) -> List[Tuple[str, LapStats]]:
+        """Drivers by best lap, tied laps ranked as in TimingBoard.display_results."""
+        return list(self.drivers.items())
+
+def parse_event(filename: str) -> Optional[EventResult]:
+    """Parse one lap file (run in a worker process); None if unreadable."""
+    board = TimingBoard()
+    # Collect the parser's warnings to print in the parent, in file order
+    output = StringIO()
+    with redirect_stdout(output):
+        ok = board.process_timing_file(filename, bulk=True)
+    if not ok:
+        print(output.getvalue(), end="")
+        return None
+    drivers = {code: LapStats.from_times(board.drivers[code].lap_times) for code in board.leaderboard}
+    return EventResult(filename, board.location, drivers, output.getvalue())
+
+class Season:
+    """Per-event results and season-wide standings over many lap files."""
+
+    def __init__(self, driver_details: Optional[Dict[str, Dict[str, str]]] = None):
+        self.events: List[EventResult] = []
+        self.drivers: Dict[str, LapStats] = {}
+        self.points: Dict[str, int] = {}
+        self.wins: Dict[str, int] = {}
+        self.driver_details = driver_details or {}
+
+    def process_files(self, filenames: List[str], workers: Optional[int] = None) -> None:
+        """Parse the files in a process pool and add them in the given order."""
+        for event in _parse_events(filenames, workers or os.cpu_count() or 1):
+            if event is not None:
+                print(event.warnings, end="")
+                self.add_event(event)
+
+    def add_event(self, event: EventResult) -> None:
+        self.events.append(event)
+        for position, (code, stats) in enumerate(event.standings()):
+            self.drivers[code] = self.drivers.get(code, LapStats()).merge(stats)
+            self.points[code] = self.points.get(code, 0) + (POINTS[position] if position < len(POINTS) else 0)
+            if position == 0:
+                self.wins[code] = self.wins.get(code, 0) + 1
+
+    def standings(self) -> List[str]:
+        """Driver codes by points, then wins, then season best lap."""
+        return sorted(self.drivers, key=lambda code: (-self.points[code], -self.wins.get(code, 0),
+                                                      self.drivers[code].fastest_lap))
+
+    def name(self, code: str) -> str:
+        return self.driver_details.get(code, {}).get('name') or code
+
+    def team(self, code: str) -> str:
+        return self.driver_details.get(code, {}).get('team') or 'N/A'
+
+    def display_results(self) -> None:
+        """Display each event and the season standings on the console."""
+        print(f"\nFormula 1 Season - {len(self.events)} events")
+        print("=" * 70)
+        if not self.events:
+            print("No timing data available.")
+            return
+
+        print(f"{'Event':<20}{'Fastest Lap':<25}{'Best Lap':<10}{'Laps':<6}{'File'}")
+        for event in self.events:
+            standings = event.standings()
+            laps = sum(stats.laps for stats in event.drivers.values())
+            if standings:
+                code, stats = standings[0]
+                print(f"{event.location:<20}{self.name(code):<25}{stats.fastest_lap:<10.3f}{laps:<6}"
+                      f"{os.path.basename(event.filename)}")
+            else:
+                print(f"{event.location:<20}{'-':<25}{'-':<10}{laps:<6}{os.path.basename(event.filename)}")
+
+        print("\nSeason Standings:")
+        print(f"{'Pos':<5}{'Driver':<18}{'Team':<20}{'Points':<8}{'Wins':<6}{'Best Lap':<10}{'Avg Lap':<10}{'Laps':<6}")
+        print("=" * 70)
+        for position, code in enumerate(self.standings(), 1):
+            stats = self.drivers[code]
+            print(f"{position:<5}{self.name(code):<18}{self.team(code):<20}{self.points[code]:<8}"
+                  f"{self.wins.get(code, 0):<6}{stats.fastest_lap:<10.3f}{stats.mean:<10.3f}{stats.laps:<6}")
+
+def _parse_events(filenames: List[str], workers: int) -> Iterator[Optional[EventResult]]:
+    if workers == 1 or len(filenames) < 2:
+        yield from map(parse_event, filenames)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(filenames))) as executor:
+        # Several files per task keeps the pickling overhead small
+        chunksize = max(1, len(filenames) // (workers * 4))
+        yield from executor.map(parse_event, filenames, chunksize=chunksize)
+
+def expand_lap_files(paths: Iterable[str]) -> List[str]:
+    """Files as given; a directory stands for its lap_times_*.txt files."""
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames += sorted((str(p) for p in Path(path).glob("lap_times_*.txt")), key=_natural_key)
+        else:
+            filenames.append(path)
+    return filenames
+
+def _natural_key(filename: str) -> List:
+    # lap_times_2.txt before lap_times_10.txt
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", filename)]
@@ -1,20 +1,130 @@
-from statistics import mean
-from typing import Dict, List, Tuple
+import math
+from array import array
+from bisect import bisect_left, insort
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+# NumPy is optional: with it, medians and percentiles run over the lap
+# buffers directly (no copy); without it they sort a Python list
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Characters read at a time by the bulk parser
+BLOCK_SIZE = 1 << 22
+# Longer lines send their block through process_lines: every line of a
+# block is read as wide as the longest one
+MAX_LINE_WIDTH = 32
 
 class Driver:
     def __init__(self, code: str):
         self.code = code
-        self.lap_times: List[float] = []
+        # Packed C doubles: 8 bytes a lap instead of a list slot plus a float object
+        self.lap_times = array('d')
         self.fastest_lap = float('inf')
+        self.total_time = 0.0
         self.name = ""
         self.team = ""
         self.number = ""
 
+    def add_lap(self, lap_time: float) -> bool:
+        """Record a lap, keeping the running totals; True if it is a new best."""
+        self.lap_times.append(lap_time)
+        self.total_time += lap_time
+        if lap_time < self.fastest_lap:
+            self.fastest_lap = lap_time
+            return True
+        return False
+
+    def add_laps(self, lap_times: array) -> bool:
+        """add_lap for a buffer of laps at once; True if it holds a new best."""
+        self.lap_times.extend(lap_times)
+        self.total_time += sum(lap_times)
+        best = min(lap_times)
+        if best != best:
+            # min() keeps a leading NaN; add_lap never takes one as the best
+            best = min((lap_time for lap_time in lap_times if lap_time == lap_time), default=float('inf'))
+        if best < self.fastest_lap:
+            self.fastest_lap = best
+            return True
+        return False
+
+    @property
+    def lap_count(self) -> int:
+        return len(self.lap_times)
+
+    @property
+    def average_lap(self) -> float:
+        return self.total_time / len(self.lap_times) if self.lap_times else float('nan')
+
+    def median_lap(self) -> float:
+        return percentile(self.lap_times, 0.5)
+
+    def percentile(self, fraction: float) -> float:
+        """Lap time below which this fraction of laps fall, e.g. 0.9."""
+        return percentile(self.lap_times, fraction)
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Linearly interpolated percentile (NumPy's default method)."""
+    if not len(values):
+        return float('nan')
+    if np is not None:
+        data = np.frombuffer(values, dtype=np.float64) if isinstance(values, array) else np.asarray(values)
+        return float(np.percentile(data, fraction * 100))
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+class Leaderboard:
+    """Driver codes ordered by fastest lap, kept sorted as laps arrive.
+
+    Only a new personal best moves a driver, and the move is a bisect
+    rather than a re-sort. Equal times rank in the order the drivers first
+    appeared, as a stable sort of the drivers by best lap would give.
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[float, int, str]] = []
+        self.keys: Dict[str, Tuple[float, int, str]] = {}
+        self.sequence = count()
+
+    def update(self, code: str, fastest_lap: float) -> int:
+        """Move code to its new fastest lap; returns its position (1-based)."""
+        old = self.keys.get(code)
+        if old is not None:
+            del self.entries[bisect_left(self.entries, old)]
+            key = (fastest_lap, old[1], code)
+        else:
+            key = (fastest_lap, next(self.sequence), code)
+        self.keys[code] = key
+        insort(self.entries, key)
+        return bisect_left(self.entries, key) + 1
+
+    def position(self, code: str) -> Optional[int]:
+        key = self.keys.get(code)
+        return bisect_left(self.entries, key) + 1 if key is not None else None
+
+    def leader(self) -> Optional[str]:
+        return self.entries[0][2] if self.entries else None
+
+    def __iter__(self) -> Iterator[str]:
+        return (code for _, _, code in self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
 class TimingBoard:
     def __init__(self):
         self.location = ""
         self.drivers: Dict[str, Driver] = {}
         self.driver_details: Dict[str, Dict[str, str]] = {}
+        self.leaderboard = Leaderboard()
+        # Running totals over every driver, for the overall average
+        self.total_time = 0.0
+        self.lap_count = 0
 
     def load_driver_details(self, filename: str) -> None:
         """Load driver details from the provided file."""
@@ -32,36 +142,15 @@ class TimingBoard:
         except Exception as e:
             print(f"Warning: Error reading driver details: {e}")
 
-    def process_timing_file(self, filename: str) -> bool:
-        """Process the timing data file."""
+    def process_timing_file(self, filename: str, bulk: bool = False) -> bool:
+        """Process the timing data file; bulk reads it in large blocks."""
         try:
             with open(filename, 'r') as f:
                 self.location = f.readline().strip()
-                
-                for line in f:
-                    line = line.strip()
-                    if len(line) < 4:  # Ensure the line is valid
-                        continue
-                    
-                    driver_code = line[:3]
-                    try:
-                        lap_time = float(line[3:])
-                    except ValueError:
-                        print(f"Warning: Invalid lap time format for {driver_code}")
-                        continue
-
-                    if driver_code not in self.drivers:
-                        self.drivers[driver_code] = Driver(driver_code)
-                        if driver_code in self.driver_details:
-                            details = self.driver_details[driver_code]
-                            self.drivers[driver_code].name = details['name']
-                            self.drivers[driver_code].team = details['team']
-                            self.drivers[driver_code].number = details['number']
-                    
-                    driver = self.drivers[driver_code]
-                    driver.lap_times.append(lap_time)
-                    driver.fastest_lap = min(driver.fastest_lap, lap_time)
-                
+                if bulk:
+                    self.process_blocks(f)
+                else:
+                    self.process_lines(f)
                 return True
         except FileNotFoundError:
             print(f"Error: File {filename} not found.")
@@ -70,13 +159,166 @@ class TimingBoard:
             print(f"Error processing file: {e}")
             return False
 
+    def process_lines(self, lines: Iterable[str]) -> None:
+        """Process lap lines (the timing file after its location line)."""
+        for line in lines:
+            self.process_line(line)
+
+    def process_blocks(self, f: TextIO, block_size: int = BLOCK_SIZE) -> None:
+        """Process the rest of f like process_lines, a block at a time.
+
+        With NumPy, each block is decoded as a byte matrix, one row a line
+        (padded when the lines differ in width): the digits of every time
+        are turned into numbers at once and laps are grouped by driver with
+        an argsort. Only malformed lines are looked at one by one, to print
+        the same warnings in the same order. Blocks it cannot decode
+        (indented, very long or non-ASCII lines), and every block without
+        NumPy, go through process_lines.
+        """
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            if not block.endswith("\n"):
+                block += f.readline()  # finish the last line
+                if not block.endswith("\n"):
+                    block += "\n"  # last line of the file
+            if not self._add_block(block):
+                self.process_lines(block.split("\n"))
+
+    def _add_block(self, block: str) -> bool:
+        """Add a block of lap lines in bulk; False, with nothing added, if
+        it has lines only the per-line parser handles correctly."""
+        if np is None or not block.isascii():
+            return False
+        data = np.frombuffer(block.encode("ascii"), dtype=np.uint8)
+        width = block.find("\n") + 1
+        if (width > 4 and len(block) % width == 0 and block.count("\n") == len(block) // width
+                and (data[width - 1::width] == ord("\n")).all()):
+            # Every line the same width (the usual "HAM90.123" layout)
+            rows = data.reshape(-1, width)
+            starts = np.arange(0, len(block), width)
+            lengths = np.full(len(rows), width - 1)
+        else:
+            ends = np.flatnonzero(data == ord("\n"))
+            starts = np.concatenate(([0], ends[:-1] + 1))
+            lengths = ends - starts
+            width = int(lengths.max()) + 1
+            if width <= 4:
+                return True  # only blank or short lines, which are skipped
+            if width > MAX_LINE_WIDTH:
+                return False
+            # Each line and whatever follows it, up to the longest line
+            padded = np.concatenate((data, np.zeros(width, dtype=np.uint8)))
+            rows = np.lib.stride_tricks.sliding_window_view(padded, width)[starts]
+        if ((rows[:, 0] <= ord(" ")) & (lengths >= 4)).any():
+            return False  # indented laps: process_line strips them first
+
+        # The lap time, a column at a time: digits with at most one decimal
+        # point, read into an integer and its number of decimals
+        numbers = np.zeros(len(rows), dtype=np.int64)
+        decimals = np.zeros(len(rows), dtype=np.int64)
+        digit_count = np.zeros(len(rows), dtype=np.int64)
+        point_count = np.zeros(len(rows), dtype=np.int64)
+        valid = np.ones(len(rows), dtype=bool)
+        for column in range(3, width - 1):
+            chars = rows[:, column]
+            inside = lengths > column
+            digits = (chars >= ord("0")) & (chars <= ord("9")) & inside
+            points = (chars == ord(".")) & inside
+            valid &= digits | points | ~inside
+            numbers = np.where(digits, numbers * 10 + (chars - ord("0")), numbers)
+            decimals += digits & (point_count > 0)
+            digit_count += digits
+            point_count += points
+        valid &= (point_count <= 1) & (digit_count > 0) & (digit_count <= 15)  # keep the integer exact
+        # An exact integer over a power of ten rounds like float() does
+        times = numbers / 10.0 ** decimals
+
+        # Lines the fast path cannot decode: parse them as process_line would
+        keep = valid.copy()
+        for i in np.flatnonzero(~valid):
+            line = block[starts[i]:starts[i] + lengths[i]]
+            if len(line.strip()) < 4:
+                continue
+            try:
+                times[i] = float(line[3:])
+                keep[i] = True
+            except ValueError:
+                print(f"Warning: Invalid lap time format for {line.strip()[:3]}")
+
+        rows_kept = np.flatnonzero(keep)
+        if not len(rows_kept):
+            return True
+        codes = rows[rows_kept, :3].astype(np.uint32)
+        keys = codes[:, 0] << 16 | codes[:, 1] << 8 | codes[:, 2]
+        # Laps grouped by driver, in file order within a driver
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        group_starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+        group_ends = np.append(group_starts[1:], len(order))
+        first_seen = order[group_starts]
+        driver_codes = [bytes(rows[rows_kept[i], :3]).decode("ascii") for i in first_seen]
+
+        # New drivers are added in the order they first appear, as line by line
+        for i in np.argsort(first_seen):
+            if driver_codes[i] not in self.drivers:
+                self._add_driver(driver_codes[i])
+
+        lap_times = times[rows_kept][order]
+        for code, start, end in zip(driver_codes, group_starts, group_ends):
+            laps = array('d')
+            laps.frombytes(lap_times[start:end].tobytes())
+            self.total_time += sum(laps)
+            self.lap_count += len(laps)
+            driver = self.drivers[code]
+            if driver.add_laps(laps):
+                self.leaderboard.update(code, driver.fastest_lap)
+        return True
+
+    def process_line(self, line: str) -> bool:
+        """Add one "<CODE><lap time>" line; False if it was skipped."""
+        line = line.strip()
+        if len(line) < 4:  # Ensure the line is valid
+            return False
+
+        driver_code = line[:3]
+        try:
+            lap_time = float(line[3:])
+        except ValueError:
+            print(f"Warning: Invalid lap time format for {driver_code}")
+            return False
+
+        self.add_lap(driver_code, lap_time)
+        return True
+
+    def add_lap(self, driver_code: str, lap_time: float) -> None:
+        """Record a lap, updating the running totals and the leaderboard."""
+        driver = self.drivers.get(driver_code) or self._add_driver(driver_code)
+        self.total_time += lap_time
+        self.lap_count += 1
+        if driver.add_lap(lap_time):
+            self.leaderboard.update(driver_code, lap_time)
+
+    def _add_driver(self, driver_code: str) -> Driver:
+        driver = self.drivers[driver_code] = Driver(driver_code)
+        if driver_code in self.driver_details:
+            details = self.driver_details[driver_code]
+            driver.name = details['name']
+            driver.team = details['team']
+            driver.number = details['number']
+        self.leaderboard.update(driver_code, driver.fastest_lap)
+        return driver
+
     def get_fastest_driver(self) -> Tuple[str, float]:
         """Get the driver with the fastest lap."""
-        if not self.drivers:
+        leader = self.leaderboard.leader()
+        if leader is None:
             return ("", float('inf'))
-        
-        fastest_driver = min(self.drivers.items(), key=lambda x: x[1].fastest_lap)
-        return (fastest_driver[0], fastest_driver[1].fastest_lap)
+        return (leader, self.drivers[leader].fastest_lap)
+
+    def overall_average(self) -> float:
+        return self.total_time / self.lap_count if self.lap_count else float('nan')
 
     def display_results(self):
         """Display the results on the console."""
@@ -91,13 +333,11 @@ class TimingBoard:
         fastest_driver = self.drivers[fastest_code]
         print(f"Fastest Lap: {fastest_driver.name or fastest_code} - {fastest_time:.3f}")
 
-        all_times = [time for driver in self.drivers.values() for time in driver.lap_times]
-        overall_average = mean(all_times)
-        print(f"Overall Average: {overall_average:.3f}")
+        print(f"Overall Average: {self.overall_average():.3f}")
 
         print("\nDetailed Results:")
         print(f"{'Driver':<15}{'Team':<20}{'Best Lap':<10}{'Avg Lap':<10}{'Laps':<5}")
         print("=" * 50)
-        for code, driver in sorted(self.drivers.items(), key=lambda x: x[1].fastest_lap):
-            avg_time = mean(driver.lap_times)
-            print(f"{driver.name or code:<15}{driver.team or 'N/A':<20}{driver.fastest_lap:<10.3f}{avg_time:<10.3f}{len(driver.lap_times):<5}")
+        for code in self.leaderboard:
+            driver = self.drivers[code]
+            print(f"{driver.name or code:<15}{driver.team or 'N/A':<20}{driver.fastest_lap:<10.3f}{driver.average_lap:<10.3f}{driver.lap_count:<5}")
@@ -0,0 +1,42 @@
+# Booking analytics charts rendered to PNG.
+# Drawn on a bare matplotlib Figure (no pyplot, no Tk), so the GUI can
+# render in a background thread and benchmarks can render headless.
+# matplotlib and seaborn are imported on first use: they are slow to load.
+import io
+
+from history_stream import AnalyticsCube
+from tracing import span
+
+
+def render_analytics_png(cube: AnalyticsCube) -> bytes:
+    """Monthly revenue and bookings by destination, side by side."""
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    if cube.rows == 0:
+        raise ValueError("No flight history data available for visualization.")
+
+    monthly_revenue = cube.monthly_series()
+    destinations = cube.destination_counts()
+
+    fig = Figure(figsize=(12, 5.5), dpi=100)
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # ax.plot rather than Series.plot, which goes through pyplot
+    ax1.plot(monthly_revenue.index, monthly_revenue.values, color='b')
+    ax1.set_title('Monthly Booking Trend')
+    ax1.set_ylabel('Total Revenue')
+    ax1.set_xlabel('Month')
+
+    sns.barplot(x=[count for _, count in destinations], y=[name for name, _ in destinations],
+                orient='h', ax=ax2)
+    ax2.set_title('Number of Flights by Destination')
+    ax2.set_ylabel('Destination')
+    ax2.set_xlabel('Number of Flights')
+
+    fig.tight_layout()
+
+    image = io.BytesIO()
+    with span("savefig"):
+        fig.savefig(image, format="png")
+    return image.getvalue()
@@ -0,0 +1,133 @@
+# Background worker for slow I/O and chart rendering.
+# Jobs run in a thread pool; their results are queued and handed back to
+# Tk on the main thread by a root.after poll, because Tk widgets must only
+# be touched from the thread running the main loop.
+import itertools
+import queue
+import time
+import tkinter as tk
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+from typing import Callable, Dict, Optional
+
+from tracing import span
+
+POLL_MS = 50
+
+
+class BackgroundWorker:
+    def __init__(self, root, max_workers: int = 2):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="io")
+        self.results: "queue.Queue" = queue.Queue()
+        # Latest generation per job key; older results for a key are stale
+        self.generations: Dict[str, int] = {}
+        self.callbacks: Dict = {}
+        self.job_ids = itertools.count()
+        self.pending = 0
+        self.status_frame: Optional[tk.Frame] = None
+        self.progress_visible = False
+        self.root.after(POLL_MS, self._poll)
+
+    def submit(self, key: str, func: Callable, *args,
+               on_done: Optional[Callable] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               message: str = "Working...", cancel_stale: bool = True) -> None:
+        """Run func(*args) off the UI thread.
+
+        on_done(result) or on_error(exception) is called on the Tk thread.
+        Submitting again with the same key cancels the earlier request: if
+        it has not started it never runs, otherwise its result is dropped.
+        Pass cancel_stale=False for writes, which must always run.
+        """
+        name = key
+        if not cancel_stale:
+            key = f"{key}#{next(self.job_ids)}"
+        generation = self.generations.get(key, 0) + 1
+        self.generations[key] = generation
+        self.pending += 1
+        self._show_progress(message)
+
+        submitted = time.perf_counter()
+
+        def run():
+            if self.generations.get(key) != generation:
+                self.results.put((key, generation, None, None, True))
+                return
+            try:
+                queued_ms = round((time.perf_counter() - submitted) * 1000, 1)
+                with span(f"job {name}", queued_ms=queued_ms):
+                    result = func(*args)
+                self.results.put((key, generation, result, None, False))
+            except Exception as e:
+                self.results.put((key, generation, None, e, False))
+
+        self.callbacks[(key, generation)] = (on_done, on_error)
+        self.executor.submit(run)
+
+    def cancel(self, key: str) -> None:
+        self.generations[key] = self.generations.get(key, 0) + 1
+
+    def cancel_all(self) -> None:
+        """Drop the results of every outstanding job, e.g. when the widgets
+        they would update are torn down. Jobs already running still finish."""
+        for key in list(self.generations):
+            self.cancel(key)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    def _poll(self) -> None:
+        try:
+            while True:
+                try:
+                    key, generation, result, error, skipped = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                self.pending -= 1
+                on_done, on_error = self.callbacks.pop((key, generation), (None, None))
+                if skipped or self.generations.get(key) != generation:
+                    continue
+                # Time the Tk-side handling, e.g. Treeview inserts
+                with span(f"done {key.split('#')[0]}"):
+                    try:
+                        if error is not None:
+                            if on_error is not None:
+                                on_error(error)
+                            else:
+                                print(f"Background job {key} failed: {error}")
+                        elif on_done is not None:
+                            on_done(result)
+                    except Exception:
+                        # A failing callback must not stop the results of later jobs
+                        print(f"Error in callback for background job {key}:")
+                        traceback.print_exc()
+
+            if self.pending == 0:
+                self._hide_progress()
+        finally:
+            try:
+                self.root.after(POLL_MS, self._poll)
+            except tk.TclError:
+                pass  # root window destroyed
+
+    def _show_progress(self, message: str) -> None:
+        if self.status_frame is None or not self.status_frame.winfo_exists():
+            self.status_frame = tk.Frame(self.root, bg="#e0e0e0")
+            self.status_label = tk.Label(self.status_frame, bg="#e0e0e0", font=('Arial', 9))
+            self.status_label.pack(side=tk.LEFT, padx=10)
+            self.progress_bar = ttk.Progressbar(self.status_frame, mode="indeterminate", length=150)
+            self.progress_bar.pack(side=tk.LEFT, padx=10)
+            self.progress_visible = False
+        self.status_label.config(text=message)
+        if not self.progress_visible:
+            self.status_frame.pack(side=tk.BOTTOM, fill="x")
+            self.progress_bar.start(10)
+            self.progress_visible = True
+
+    def _hide_progress(self) -> None:
+        if self.progress_visible and self.status_frame.winfo_exists():
+            self.progress_bar.stop()
+            self.status_frame.pack_forget()
+        self.progress_visible = False
@@ -0,0 +1,117 @@
+# Throughput benchmark for the local booking server.
+# Starts booking_server in a separate process on a temporary database,
+# then books seats over keep-alive HTTP connections from many concurrent
+# asyncio clients and reports bookings per second.
+#
+# Usage: python bench_booking_server.py [--clients N] [--bookings N] [--port N]
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from booking_service import BookingService
+from booking_store import SQLiteBookingStore
+from booking_server import serve
+
+FLIGHTS = 20
+
+
+def setup_database(db_file, seats):
+    store = SQLiteBookingStore(db_file)
+    with store._transaction() as conn:
+        conn.executemany(
+            "INSERT INTO flights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(f"BN{i:03d}", "Bench Air", "Kathmandu", "Pokhara", 1704103200, "Ongoing", seats, 0, 1000)
+             for i in range(FLIGHTS)]
+        )
+    store.close()
+
+
+def run_server(db_file, port):
+    asyncio.run(serve(BookingService(SQLiteBookingStore(db_file)), "127.0.0.1", port))
+
+
+async def client(port, client_id, bookings, statuses):
+    for _ in range(100):
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            break
+        except OSError:
+            await asyncio.sleep(0.05)  # server still starting
+    else:
+        raise RuntimeError("could not connect to the booking server")
+
+    for i in range(bookings):
+        body = json.dumps({
+            "flight_id": f"BN{(client_id + i) % FLIGHTS:03d}",
+            "user_name": f"Client {client_id}",
+            "user_address": "Benchmark",
+            "user_phone": f"98{client_id:04d}{i:04d}",
+            "user_id": f"B-{client_id}-{i}",
+        }).encode()
+        writer.write(
+            b"POST /bookings HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b"\r\n":
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    writer.close()
+
+
+async def run_clients(port, clients, bookings):
+    statuses = {}
+    await asyncio.gather(*(client(port, i, bookings, statuses) for i in range(clients)))
+    return statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Booking server throughput benchmark")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--bookings", type=int, default=100, help="bookings per client")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "bench.db")
+        setup_database(db_file, seats=args.clients * args.bookings)
+
+        server = multiprocessing.Process(target=run_server, args=(db_file, args.port), daemon=True)
+        server.start()
+        try:
+            asyncio.run(run_clients(args.port, 1, 1))  # wait until the server is up
+            start = time.perf_counter()
+            statuses = asyncio.run(run_clients(args.port, args.clients, args.bookings))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.terminate()
+            server.join()
+
+        store = SQLiteBookingStore(db_file)
+        stored = store.count_bookings()
+        store.close()
+
+    total = args.clients * args.bookings
+    created = statuses.get(201, 0)
+    print(f"Clients: {args.clients}  Requests: {total}  Time: {elapsed:.2f}s")
+    print(f"Throughput: {created / elapsed:.0f} bookings/s")
+    print(f"Responses: {dict(sorted(statuses.items()))}  Bookings stored: {stored}")
+    if created != total or stored != total + 1:
+        raise SystemExit("FAIL: not every request produced a booking")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Query latency benchmark for flight search.
+# Builds a synthetic catalog (100k flights over 40 airports and a year of
+# departures by default), indexes it, then times direct searches and
+# one-stop connection searches with random routes and date windows.
+#
+# Usage: python bench_flight_search.py [--flights N] [--airports N] [--queries N]
+import argparse
+import random
+import statistics
+import time
+
+from flight_catalog import FlightCatalog
+from flight_search import FlightSearch
+
+YEAR_START = 1735689600  # 2025-01-01 UTC
+DAY = 24 * 3600
+TARGET_MS = 50
+
+
+def make_catalog(flights, airports, seed=1):
+    rng = random.Random(seed)
+    names = [f"Airport {i:02d}" for i in range(airports)]
+    rows = []
+    for i in range(flights):
+        origin, destination = rng.sample(names, 2)
+        max_seats = rng.choice([60, 120, 180])
+        rows.append({
+            "Airline Name": f"Airline {i % 12}",
+            "Flight ID": f"BF{i:06d}",
+            "From Destination": origin,
+            "To Destination": destination,
+            "Scheduled Time": YEAR_START + rng.randrange(365 * DAY),
+            "Status": rng.choice(["Ongoing", "Ongoing", "Ongoing", "Rescheduled", "Cancelled"]),
+            "Max Seats": max_seats,
+            "Occupied Seats": rng.randrange(max_seats + 1),
+            "Price": rng.randrange(2000, 40000, 50),
+        })
+    return FlightCatalog(rows), names
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flight search latency benchmark")
+    parser.add_argument("--flights", type=int, default=100_000)
+    parser.add_argument("--airports", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    catalog, names = make_catalog(args.flights, args.airports)
+    start = time.perf_counter()
+    finder = FlightSearch(catalog)
+    print(f"Catalog: {len(catalog)} flights, {args.airports} airports  "
+          f"Index build: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(2)
+    statuses = ["Ongoing", "Rescheduled"]
+    timings = {"direct": [], "one stop": []}
+    found = {"direct": 0, "one stop": 0}
+    for _ in range(args.queries):
+        origin, destination = rng.sample(names, 2)
+        day = YEAR_START + rng.randrange(358) * DAY
+        window = (day, day + 7 * DAY - 1)  # a one-week departure window
+        max_price = rng.choice([None, 20000, 40000])
+
+        start = time.perf_counter()
+        direct = finder.search(origin, destination, *window, max_price=max_price, seats=2, statuses=statuses)
+        timings["direct"].append((time.perf_counter() - start) * 1000)
+        found["direct"] += len(direct)
+
+        start = time.perf_counter()
+        connections = finder.connections(origin, destination, *window, max_price=max_price and max_price * 2,
+                                         seats=2, statuses=statuses)
+        timings["one stop"].append((time.perf_counter() - start) * 1000)
+        found["one stop"] += len(connections)
+
+    failed = False
+    for kind, values in timings.items():
+        p95 = percentile(values, 0.95)
+        print(f"{kind:>8}: median {statistics.median(values):6.2f} ms  p95 {p95:6.2f} ms  "
+              f"max {max(values):6.2f} ms  avg results {found[kind] / args.queries:.1f}")
+        failed |= p95 > TARGET_MS
+    if failed:
+        raise SystemExit(f"FAIL: p95 latency above {TARGET_MS} ms")
+    print(f"OK: p95 latency under {TARGET_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Multi-process stress benchmark for seat reservation.
+# Several worker processes book the same flight as fast as they can; the
+# benchmark reports bookings per second and checks nothing was oversold
+# and no seat was given out twice.
+#
+# Usage: python bench_seat_reservation.py [--workers N] [--seats N] [--flights N]
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from booking_store import SQLiteBookingStore, SeatUnavailableError
+
+
+def make_booking(flight_id, worker, attempt):
+    return {
+        "Booking Date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "Airline Name": "Bench Air",
+        "Flight ID": flight_id,
+        "From Destination": "Kathmandu",
+        "To Destination": "Pokhara",
+        "Scheduled Time": "2024-01-01 10:00:00",
+        "Price": 1000,
+        "Seat": "",
+        "User Name": f"Worker {worker}",
+        "User Address": "Benchmark",
+        "User Phone": f"98{worker:04d}{attempt:04d}",
+        "User ID": f"B-{worker}-{attempt}",
+    }
+
+
+def setup_database(db_file, flights, seats):
+    store = SQLiteBookingStore(db_file)
+    with store._transaction() as conn:
+        conn.executemany(
+            "INSERT INTO flights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(f"BN{i:03d}", "Bench Air", "Kathmandu", "Pokhara", 1704103200, "Ongoing", seats, 0, 1000)
+             for i in range(flights)]
+        )
+    store.close()
+
+
+def worker(db_file, worker_id, flights, start_event, results):
+    store = SQLiteBookingStore(db_file)
+    booked = rejected = attempt = 0
+    full = set()
+    start_event.wait()
+
+    # Keep booking round-robin until every flight reports full
+    while len(full) < flights:
+        flight_id = f"BN{attempt % flights:03d}"
+        attempt += 1
+        if flight_id in full:
+            continue
+        try:
+            store.book(make_booking(flight_id, worker_id, attempt))
+            booked += 1
+        except SeatUnavailableError:
+            full.add(flight_id)
+            rejected += 1
+
+    store.close()
+    results.put((booked, rejected))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seat reservation stress benchmark")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seats", type=int, default=500)
+    parser.add_argument("--flights", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "bench.db")
+        setup_database(db_file, args.flights, args.seats)
+
+        start_event = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(db_file, i, args.flights, start_event, results))
+            for i in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        start = time.perf_counter()
+        start_event.set()
+        totals = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+
+        booked = sum(b for b, _ in totals)
+        rejected = sum(r for _, r in totals)
+
+        store = SQLiteBookingStore(db_file)
+        oversold = store.conn.execute(
+            "SELECT COUNT(*) FROM flights WHERE occupied_seats > max_seats"
+        ).fetchone()[0]
+        history_rows = store.conn.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+        occupied = store.conn.execute("SELECT SUM(occupied_seats) FROM flights").fetchone()[0]
+        double_booked = store.conn.execute(
+            "SELECT COUNT(*) - COUNT(DISTINCT flight_id || ' ' || seat) FROM bookings"
+        ).fetchone()[0]
+        store.close()
+
+    capacity = args.flights * args.seats
+    print(f"Workers: {args.workers}  Flights: {args.flights}  Seats per flight: {args.seats}")
+    print(f"Bookings: {booked}  Rejected attempts: {rejected}  Time: {elapsed:.2f}s")
+    print(f"Throughput: {booked / elapsed:.0f} bookings/s")
+    print(f"Capacity: {capacity}  Occupied: {occupied}  History rows: {history_rows}  "
+          f"Double-booked seats: {double_booked}")
+
+    if (oversold or double_booked or booked != capacity or occupied != capacity
+            or history_rows != capacity):
+        print("FAIL: seat counts and bookings are inconsistent")
+        raise SystemExit(1)
+    print("OK: no flight oversold, no seat booked twice")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Startup benchmark: time from launching the interpreter to the login window.
+# Runs main.py in a fresh interpreter with -X importtime, stops as soon as
+# the login window has been drawn, and reports the wall time plus the
+# slowest imports made before the window appeared.
+#
+# Usage: python bench_startup.py [--runs N] [--top N]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Run inside the child: draw the login window once, then exit instead of
+# entering the main loop
+CHILD = r"""
+import sys, tkinter as tk
+def mainloop(self, n=0):
+    self.update()
+    sys.stderr.write("LOGIN_WINDOW_SHOWN\n")
+    sys.stderr.flush()
+    self.destroy()
+tk.Tk.mainloop = mainloop
+import main
+main.create_login_ui()
+"""
+
+
+def run_once():
+    """Return (seconds to login window, {module: cumulative import us})."""
+    start = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    elapsed = None
+    imports = {}
+    for line in child.stderr:
+        if line.startswith("LOGIN_WINDOW_SHOWN"):
+            elapsed = time.perf_counter() - start
+            break
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                imports[name.rstrip("\n")] = int(cumulative)
+    child.stderr.read()  # imports made after the window are not counted
+    child.wait()
+    if elapsed is None:
+        raise RuntimeError("main.py exited before showing the login window")
+    return elapsed, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-login-window benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    times = []
+    imports = {}
+    for _ in range(args.runs):
+        elapsed, imports = run_once()
+        times.append(elapsed)
+
+    print(f"Time to login window: median {statistics.median(times) * 1000:.0f} ms, "
+          f"min {min(times) * 1000:.0f} ms over {args.runs} runs")
+    # Nested modules are indented in -X importtime output; list top-level ones
+    top_level = {name.strip(): us for name, us in imports.items() if not name.startswith("  ")}
+    print("Slowest imports before the window (last run, cumulative):")
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    # The store is opened on a worker thread, so pandas may show up here
+    # without having delayed the window
+    heavy = [name for name in ("pandas", "matplotlib", "seaborn") if name in top_level]
+    if heavy:
+        print(f"Imported by the time the window was shown (any thread): {', '.join(heavy)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# Headless benchmark suite over synthetic data.
+# For each size, generates a catalog and history (synthetic_data.py), loads
+# them into a fresh SQLite store and times the paths the GUI runs:
+#   flight_load      read, index and format the flights (Flights tab)
+#   history_page     count and first page of bookings (Flight History tab)
+#   history_scan     stream every booking in chunks (imports, cube rebuilds)
+#   user_search      booking search by name, phone and ID
+#   stats            statistics panel aggregates
+#   analytics_cube   cube behind the charts
+#   booking_commit   single bookings, one transaction each
+#   booking_batch    book_many batches, as bulk_import.py uses
+#   chart_render     the analytics charts to PNG
+# Loading the store goes through the same inserts and search index as the
+# app, so the largest sizes take minutes to set up. Generating and loading
+# are timed once and reported, but not checked against the baseline.
+# The booking cases run on a fresh copy of the loaded store each time, so
+# every run books into the same data and the other cases never see them.
+# Results are written as JSON. Pass --baseline with an earlier results file
+# to print the change per case; the run fails if any case got slower than
+# the tolerance allows.
+#
+# Usage: python bench_suite.py [--sizes 1000,100000] [--repeat N] [--out FILE]
+#                              [--baseline FILE] [--tolerance 0.25] [--cases a,b]
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from analytics_chart import render_analytics_png
+from booking_service import BookingService
+from booking_store import SQLiteBookingStore, SeatUnavailableError
+from history_stream import AnalyticsCube
+from synthetic_data import SyntheticData
+from table_format import format_flight_rows
+
+SINGLE_BOOKINGS = 200
+BATCH_SIZE = 1000
+PAGE_SIZE = 200
+
+
+class Bench:
+    """One generated data set loaded into a store, and the cases over it."""
+
+    def __init__(self, data: SyntheticData, store: SQLiteBookingStore, seed: int):
+        self.data = data
+        self.store = store
+        self.rng = np.random.default_rng(seed)
+        user = data.sample_user(data.bookings // 2)
+        self.search_terms = [user["User Name"], user["User Phone"], user["User ID"], "no such user"]
+
+    def flight_load(self) -> int:
+        flights = self.store.read_flights()
+        BookingService(self.store).refresh(flights)
+        return len(format_flight_rows(flights))
+
+    def history_page(self) -> int:
+        self.store.count_bookings()
+        return len(self.store.read_history_page(0, PAGE_SIZE))
+
+    def history_scan(self) -> int:
+        return sum(len(chunk) for chunk in self.store.iter_history_chunks())
+
+    def user_search(self) -> int:
+        for term in self.search_terms:
+            self.store.search_bookings(term, 0, PAGE_SIZE)
+        return len(self.search_terms)
+
+    def stats(self) -> int:
+        self.store.read_statistics()
+        return 1
+
+    def analytics_cube(self) -> int:
+        AnalyticsCube.from_rows(self.store.read_analytics_cube())
+        return 1
+
+    def booking_commit(self) -> int:
+        booked = 0
+        for booking in self._bookings(SINGLE_BOOKINGS):
+            try:
+                self.store.book(booking)
+                booked += 1
+            except SeatUnavailableError:
+                pass
+        return booked
+
+    def booking_batch(self) -> int:
+        results = self.store.book_many(self._bookings(BATCH_SIZE))
+        return sum(reason is None for reason in results)
+
+    def chart_render(self) -> int:
+        render_analytics_png(AnalyticsCube.from_rows(self.store.read_analytics_cube()))
+        return 1
+
+    def _bookings(self, count: int):
+        # Spread over the flights with the most free seats, so the
+        # benchmark measures bookings rather than full-flight rejections
+        flights = self.data.flights
+        free = (flights["Max Seats"] - flights["Occupied Seats"]).to_numpy()
+        candidates = flights.iloc[np.argsort(-free)[:max(count // 10, 1)]]
+        picks = candidates.iloc[self.rng.integers(0, len(candidates), count)].to_dict("records")
+        booked_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        return [{
+            "Booking Date": booked_at,
+            "Airline Name": flight["Airline Name"],
+            "Flight ID": flight["Flight ID"],
+            "From Destination": flight["From Destination"],
+            "To Destination": flight["To Destination"],
+            "Scheduled Time": pd.to_datetime(flight["Scheduled Time"], unit='s').strftime('%Y-%m-%d %H:%M:%S'),
+            "Price": flight["Price"],
+            "Seat": None,
+            "User Name": "Bench User",
+            "User Address": "Benchmark",
+            "User Phone": f"98{i:08d}",
+            "User ID": f"B-{i:07d}",
+        } for i, flight in enumerate(picks)]
+
+
+CASES = ["flight_load", "history_page", "history_scan", "user_search", "stats", "analytics_cube",
+         "booking_commit", "booking_batch", "chart_render"]
+# Cases that write to the store
+MUTATING_CASES = {"booking_commit", "booking_batch"}
+# One-shot setup timings: too noisy to hold to the tolerance
+SETUP_CASES = {"generate", "store_load"}
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def copy_store(store: SQLiteBookingStore, db_file: str) -> SQLiteBookingStore:
+    """A copy of store in db_file, replacing any earlier copy there."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_file + suffix):
+            os.remove(db_file + suffix)
+    target = sqlite3.connect(db_file)
+    store.conn.backup(target)
+    target.close()
+    return SQLiteBookingStore(db_file)
+
+
+def run_size(bookings: int, repeat: int, seed: int, cases, directory: str):
+    results = []
+
+    def record(case, runs, ops):
+        median = statistics.median(runs)
+        results.append({
+            "case": case, "bookings": bookings, "flights": len(data.flights),
+            "median_ms": round(median * 1000, 3), "min_ms": round(min(runs) * 1000, 3),
+            "runs_ms": [round(run * 1000, 3) for run in runs],
+            "ops": ops, "ops_per_s": round(ops / median, 1) if median else None,
+        })
+        print(f"{bookings:>10} {case:<16}{median * 1000:>12.2f} ms  {ops / median if median else 0:>12.0f} ops/s")
+
+    elapsed, data = timed(lambda: SyntheticData(bookings, seed=seed))
+    record("generate", [elapsed], bookings)
+
+    store = SQLiteBookingStore(os.path.join(directory, f"bench_{bookings}.db"))
+    elapsed, _ = timed(lambda: store.replace_contents(data.flights, data.iter_history()))
+    record("store_load", [elapsed], bookings)
+
+    bench = Bench(data, store, seed)
+    copy_file = os.path.join(directory, f"bench_{bookings}_copy.db")
+    for case in cases:
+        runs = []
+        # The first run is a warm-up: imports, SQLite page cache
+        for run in range(repeat + 1):
+            if case in MUTATING_CASES:
+                bench.store = copy_store(store, copy_file)
+            try:
+                elapsed, ops = timed(getattr(bench, case))
+            finally:
+                if bench.store is not store:
+                    bench.store.close()
+                    bench.store = store
+            if run:
+                runs.append(elapsed)
+        record(case, runs, ops)
+    store.close()
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "packages": {"numpy": np.__version__, "pandas": pd.__version__, "matplotlib": matplotlib.__version__},
+    }
+
+
+def compare(results, baseline_file: str, tolerance: float) -> bool:
+    """Print each case against the baseline; True if any case regressed."""
+    with open(baseline_file, encoding="utf-8") as f:
+        baseline = {(r["case"], r["bookings"]): r for r in json.load(f)["results"]}
+    regressed = False
+    print(f"\nAgainst {baseline_file} (tolerance {tolerance:.0%}):")
+    for result in results:
+        before = baseline.get((result["case"], result["bookings"]))
+        if before is None or not before["median_ms"] or result["case"] in SETUP_CASES:
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1
+        slower = change > tolerance
+        regressed |= slower
+        print(f"{result['bookings']:>10} {result['case']:<16}{before['median_ms']:>10.2f} -> "
+              f"{result['median_ms']:>10.2f} ms  {change:+7.1%}{'  REGRESSION' if slower else ''}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite over synthetic flights and bookings")
+    parser.add_argument("--sizes", default="1000,100000",
+                        help="comma-separated booking counts, from 1000 up to 10000000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", help=f"comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    cases = args.cases.split(",") if args.cases else CASES
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes.split(","):
+            results += run_size(int(size), args.repeat, args.seed, cases, directory)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "seed": args.seed, "repeat": args.repeat,
+                   "results": results}, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit("FAIL: slower than the baseline")
+
+
+if __name__ == "__main__":
+    main()
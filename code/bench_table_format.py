@@ -0,0 +1,99 @@
+# Benchmark: per-row iterrows() formatting vs the column-at-a-time pipeline.
+#
+# Usage: python bench_table_format.py [--rows N]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from table_format import format_flight_rows, format_history_rows
+
+
+def make_flights(rows):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Airline Name": rng.choice(["Buddha Air", "Yeti Airlines", "Summit Air"], rows),
+        "Flight ID": [f"F{i:06d}" for i in range(rows)],
+        "From Destination": rng.choice(["Kathmandu", "Pokhara", "Jomsom"], rows),
+        "To Destination": rng.choice(["Bhairahawa", "Biratnagar", "Dubai"], rows),
+        "Scheduled Time": rng.integers(1_700_000_000, 1_800_000_000, rows),
+        "Status": rng.choice(["Ongoing", "Rescheduled", "Canceled"], rows),
+        "Max Seats": rng.integers(100, 250, rows),
+        "Occupied Seats": rng.integers(0, 100, rows),
+        "Price": rng.integers(2000, 9000, rows),
+    })
+
+
+def make_history(flights):
+    history = flights.rename(columns={"Max Seats": "Seat"})[[
+        "Airline Name", "Flight ID", "From Destination", "To Destination", "Scheduled Time", "Price", "Seat"
+    ]].copy()
+    history.insert(0, "Booking Date", format_epoch(flights["Scheduled Time"] - 86400))
+    history["Scheduled Time"] = format_epoch(flights["Scheduled Time"])
+    history["User Name"] = "Bench User"
+    history["User Address"] = "Kathmandu"
+    history["User Phone"] = "9800000000"
+    history["User ID"] = "U-00000"
+    return history
+
+
+def format_epoch(column):
+    return pd.to_datetime(column, unit='s').dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+# The formatting code that display_flights/display_flight_history used to run
+def per_row_flights(df):
+    rows = []
+    for _, row in df.iterrows():
+        scheduled_time = pd.to_datetime(row["Scheduled Time"], unit='s')
+        rows.append((
+            row["Airline Name"], row["Flight ID"], row["From Destination"],
+            row["To Destination"], scheduled_time.strftime('%Y-%m-%d %H:%M:%S'),
+            row["Status"], row["Max Seats"], row["Occupied Seats"], row["Price"]
+        ))
+    return rows
+
+
+def per_row_history(df):
+    rows = []
+    for _, row in df.iterrows():
+        booking_date = pd.to_datetime(row["Booking Date"]).strftime('%Y-%m-%d %H:%M:%S')
+        scheduled_time = pd.to_datetime(row["Scheduled Time"]).strftime('%Y-%m-%d %H:%M:%S')
+        rows.append((
+            booking_date, row["Airline Name"], row["Flight ID"], row["From Destination"],
+            row["To Destination"], scheduled_time, row["Price"], row["Seat"],
+            row["User Name"], row["User Address"], row["User Phone"], row["User ID"]
+        ))
+    return rows
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    rows = func(df)
+    return time.perf_counter() - start, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Table formatting benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    flights = make_flights(args.rows)
+    history = make_history(flights)
+
+    print(f"Rows: {args.rows}")
+    print(f"{'Table':<10}{'Per-row (s)':<15}{'Vectorized (s)':<17}{'Speed-up':<10}")
+    for name, df, old, new in [
+        ("flights", flights, per_row_flights, format_flight_rows),
+        ("history", history, per_row_history, format_history_rows),
+    ]:
+        old_time, old_rows = timed(old, df)
+        new_time, new_rows = timed(new, df)
+        if [tuple(map(str, r)) for r in old_rows] != [tuple(map(str, r)) for r in new_rows]:
+            raise SystemExit(f"FAIL: {name} rows differ between the two paths")
+        print(f"{name:<10}{old_time:<15.3f}{new_time:<17.3f}{old_time / new_time:<10.1f}")
+
+
+if __name__ == "__main__":
+    main()
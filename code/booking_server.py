@@ -0,0 +1,195 @@
+# Small local HTTP/JSON front end for BookingService.
+# Built on asyncio streams so many clients can be served at once without
+# extra dependencies; store calls run in worker threads.
+#
+# Usage: python booking_server.py [--host 127.0.0.1] [--port 8080] [--db flights.db]
+#
+#   GET    /flights?from=..&to=..&status=..   search flights
+#   GET    /itineraries?from=..&to=..&date_from=..&date_to=..&min_price=..
+#                       &max_price=..&seats=..&max_legs=..
+#                                             direct flights and connections
+#   GET    /flights/<flight id>               one flight
+#   PATCH  /flights/<flight id>               edit a flight (JSON fields)
+#   POST   /bookings                          book (JSON: flight_id, user_name,
+#                                             user_address, user_phone, user_id,
+#                                             optional seat or seat_preference,
+#                                             or party_size for that many
+#                                             side-by-side seats: returns a list)
+#   GET    /bookings/<booking id>             one booking
+#   DELETE /bookings/<booking id>             cancel a booking
+import argparse
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from booking_service import BookingError, BookingService, NotFoundError
+from booking_store import SeatUnavailableError, open_store
+
+FlightInformationFile = "flights.xlsx"
+FlightHistoryFile = "flight_history.xlsx"
+FlightDatabaseFile = "flights.db"
+
+MAX_BODY = 1 << 20
+
+
+class BookingServer:
+    def __init__(self, service: BookingService):
+        self.service = service
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # Keep-alive: serve requests until the client closes the connection
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self.dispatch(method, path, body)
+                write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # client went away or sent something that is not HTTP
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, object]:
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                return HTTPStatus.BAD_REQUEST, {"error": "Request body must be a JSON object"}
+            return await asyncio.to_thread(self.route, method, parts, parse_qs(url.query), data)
+        except json.JSONDecodeError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Request body must be JSON"}
+        except NotFoundError as e:
+            return HTTPStatus.NOT_FOUND, {"error": str(e)}
+        except SeatUnavailableError as e:
+            return HTTPStatus.CONFLICT, {"error": str(e)}
+        except (BookingError, ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            # e.g. a database error: answer rather than drop the connection
+            print(f"Error handling {method} {target}: {e!r}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+    def route(self, method: str, parts, query: Dict, data: Dict) -> Tuple[HTTPStatus, object]:
+        service = self.service
+        if parts == ["flights"] and method == "GET":
+            return HTTPStatus.OK, service.search(
+                from_destination=_first(query, "from"),
+                to_destination=_first(query, "to"),
+                status=_first(query, "status"),
+            )
+        if parts == ["itineraries"] and method == "GET":
+            return HTTPStatus.OK, service.find_flights(
+                from_destination=_first(query, "from"),
+                to_destination=_first(query, "to"),
+                date_from=_first(query, "date_from"),
+                date_to=_first(query, "date_to"),
+                min_price=_int(query, "min_price"),
+                max_price=_int(query, "max_price"),
+                seats=_int(query, "seats") or 1,
+                max_legs=_int(query, "max_legs") or 1,
+            )
+        if len(parts) == 2 and parts[0] == "flights":
+            if method == "GET":
+                return HTTPStatus.OK, service.get_flight(parts[1])
+            if method == "PATCH":
+                return HTTPStatus.OK, service.edit(parts[1], data)
+        if parts == ["bookings"] and method == "POST":
+            if data.get("party_size") is not None:
+                return HTTPStatus.CREATED, service.book_party(
+                    data.get("flight_id", ""), data.get("user_name", ""), data.get("user_address", ""),
+                    data.get("user_phone", ""), data.get("user_id", ""), data["party_size"],
+                )
+            booking = service.book(
+                data.get("flight_id", ""), data.get("user_name", ""), data.get("user_address", ""),
+                data.get("user_phone", ""), data.get("user_id", ""), data.get("seat"),
+                data.get("seat_preference"),
+            )
+            return HTTPStatus.CREATED, booking
+        if len(parts) == 2 and parts[0] == "bookings":
+            booking_id = int(parts[1])
+            if method == "GET":
+                booking = service.store.get_booking(booking_id)
+                if booking is None:
+                    raise NotFoundError(f"Booking {booking_id} not found")
+                return HTTPStatus.OK, booking
+            if method == "DELETE":
+                return HTTPStatus.OK, service.cancel(booking_id)
+        return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} /{'/'.join(parts)}"}
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes, bool]]:
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, version = request_line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        raise ConnectionError("request body too large")
+    body = await reader.readexactly(length) if length else b""
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method.upper(), target, body, keep_alive
+
+
+def write_response(writer: asyncio.StreamWriter, status: HTTPStatus, payload, keep_alive: bool) -> None:
+    body = json.dumps(payload, default=str).encode()
+    writer.write(
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+    )
+
+
+def _first(query: Dict, name: str) -> Optional[str]:
+    values = query.get(name)
+    return values[0] if values else None
+
+
+def _int(query: Dict, name: str) -> Optional[int]:
+    value = _first(query, name)
+    return int(value) if value else None  # ValueError becomes 400
+
+
+async def serve(service: BookingService, host: str, port: int) -> None:
+    server = await BookingServer(service).start(host, port)
+    print(f"Booking server listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local booking HTTP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default=FlightDatabaseFile)
+    args = parser.parse_args()
+
+    service = BookingService(open_store(args.db, FlightInformationFile, FlightHistoryFile))
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
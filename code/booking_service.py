@@ -0,0 +1,240 @@
+# Headless booking service.
+# The search/book/cancel/edit rules used to live inside the Tk callbacks in
+# main.py. They are here so the GUI, scripts, batch jobs and the HTTP
+# server (booking_server.py) all go through the same code.
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from booking_store import BookingStore
+from flight_catalog import FlightCatalog
+from flight_search import FlightSearch
+from seat_map import PREFERENCES
+
+BOOKABLE_STATUSES = ["Ongoing", "Rescheduled"]
+EDITABLE_FIELDS = ["Airline Name", "From Destination", "To Destination",
+                   "Scheduled Time", "Status", "Max Seats", "Occupied Seats", "Price"]
+INTEGER_FIELDS = ["Max Seats", "Occupied Seats", "Price"]
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class BookingError(Exception):
+    """A request the service refuses, e.g. missing fields or a cancelled flight."""
+
+
+class NotFoundError(BookingError):
+    pass
+
+
+class BookingService:
+    def __init__(self, store: BookingStore):
+        self.store = store
+        self.catalog: Optional[FlightCatalog] = None
+        self.finder: Optional[FlightSearch] = None
+
+    def refresh(self, flights: Optional[pd.DataFrame] = None) -> FlightCatalog:
+        """Reload the flight catalog used by search() and find_flights(),
+        from flights if the caller has just read them."""
+        if flights is None:
+            flights = self.store.read_flights()
+        self.catalog = FlightCatalog.from_dataframe(flights)
+        self.finder = FlightSearch(self.catalog)
+        return self.catalog
+
+    def search(self, from_destination: Optional[str] = None, to_destination: Optional[str] = None,
+               status: Optional[str] = None) -> List[Dict]:
+        """Flights matching every given filter.
+
+        Seat counts come from the cached catalog, which confirm(), cancel()
+        and edit() keep up to date. Bookings made by other processes show
+        after refresh(); book() always checks the store, so a stale count
+        can never cause an overbooking.
+        """
+        catalog = self.catalog or self.refresh()
+        if from_destination and to_destination:
+            flights = catalog.by_route(from_destination, to_destination)
+        elif from_destination:
+            flights = catalog.by_origin(from_destination)
+        elif status:
+            flights = catalog.by_status(status)
+        else:
+            flights = list(catalog.flights.values())
+
+        return [
+            flight for flight in flights
+            if (not to_destination or flight["To Destination"] == to_destination)
+            and (not status or flight["Status"] == status)
+        ]
+
+    def find_flights(self, from_destination: Optional[str] = None, to_destination: Optional[str] = None,
+                     date_from: Optional[str] = None, date_to: Optional[str] = None,
+                     min_price: Optional[int] = None, max_price: Optional[int] = None,
+                     seats: int = 1, max_legs: int = 1) -> List[List[Dict]]:
+        """Bookable itineraries departing between date_from and date_to
+        (YYYY-MM-DD, inclusive) with enough free seats.
+
+        Each itinerary is a list of flights: direct flights first, then,
+        if max_legs > 1 and both ends are given, connections cheapest first.
+        """
+        if self.finder is None:
+            self.refresh()
+        depart_after = _day_start(date_from) if date_from else None
+        depart_before = _day_start(date_to) + 24 * 3600 - 1 if date_to else None
+        itineraries = [[flight] for flight in self.finder.search(
+            from_destination, to_destination, depart_after, depart_before,
+            min_price, max_price, seats, BOOKABLE_STATUSES,
+        )]
+        if max_legs > 1 and from_destination and to_destination:
+            itineraries += self.finder.connections(
+                from_destination, to_destination, depart_after, depart_before,
+                max_price, seats, BOOKABLE_STATUSES, max_legs,
+            )
+        return itineraries
+
+    def get_flight(self, flight_id: str) -> Dict:
+        flight = self.store.get_flight(flight_id)
+        if flight is None:
+            raise NotFoundError("Flight ID not found")
+        return flight
+
+    def new_booking(self, flight_id: str, user_name: str, user_address: str,
+                    user_phone: str, user_id: str, seat: Optional[str] = None,
+                    booking_date: Optional[str] = None, flight: Optional[Dict] = None) -> Dict:
+        """Validate a request and build the booking record, without saving it.
+
+        Pass flight to skip looking it up in the store (e.g. in bulk imports).
+        booking_date may be any ISO 8601 date or date and time; it is stored
+        as YYYY-MM-DD HH:MM:SS like the bookings made in the app.
+        """
+        user_info = [str(value).strip() for value in (user_name, user_address, user_phone, user_id)]
+        if not all(user_info):
+            raise BookingError("Please fill out all fields.")
+
+        if flight is None:
+            flight = self.get_flight(flight_id)
+        if flight["Status"] not in BOOKABLE_STATUSES:
+            raise BookingError("This flight has been cancelled.")
+
+        booking_date = _booking_date(booking_date) if booking_date else datetime.now()
+        return {
+            "Booking Date": booking_date.strftime(DATE_FORMAT),
+            "Airline Name": flight["Airline Name"],
+            "Flight ID": flight["Flight ID"],
+            "From Destination": flight["From Destination"],
+            "To Destination": flight["To Destination"],
+            "Scheduled Time": pd.to_datetime(flight["Scheduled Time"], unit='s').strftime(DATE_FORMAT),
+            "Price": flight["Price"],
+            # Empty until confirm(): the store assigns it from the seat map
+            "Seat": seat or None,
+            "User Name": user_info[0],
+            "User Address": user_info[1],
+            "User Phone": user_info[2],
+            "User ID": user_info[3],
+        }
+
+    def confirm(self, booking: Dict, seat_preference: Optional[str] = None) -> Dict:
+        """Save a booking built by new_booking() and assign its seat.
+
+        seat_preference is "window", "middle" or "aisle". Raises
+        SeatUnavailableError if the flight is full or the seat is taken.
+        """
+        if seat_preference and seat_preference not in PREFERENCES:
+            raise BookingError(f"Seat preference must be one of: {', '.join(PREFERENCES)}")
+        booking_id = self.store.book(booking, seat_preference)
+        self._refresh_seats(booking["Flight ID"])
+        return {"Booking ID": booking_id, **booking}
+
+    def book(self, flight_id: str, user_name: str, user_address: str, user_phone: str,
+             user_id: str, seat: Optional[str] = None, seat_preference: Optional[str] = None) -> Dict:
+        booking = self.new_booking(flight_id, user_name, user_address, user_phone, user_id, seat)
+        return self.confirm(booking, seat_preference)
+
+    def book_party(self, flight_id: str, user_name: str, user_address: str, user_phone: str,
+                   user_id: str, party_size: int) -> List[Dict]:
+        """Book party_size seats side by side in one row, all under one user.
+
+        Raises SeatUnavailableError if no row has that many adjacent free seats.
+        """
+        if isinstance(party_size, bool) or not isinstance(party_size, int) or party_size < 1:
+            raise BookingError("Party size must be a whole number of at least 1")
+        booking = self.new_booking(flight_id, user_name, user_address, user_phone, user_id)
+        bookings = [dict(booking) for _ in range(party_size)]
+        booking_ids = self.store.book_party(bookings)
+        self._refresh_seats(booking["Flight ID"])
+        return [{"Booking ID": booking_id, **booking} for booking_id, booking in zip(booking_ids, bookings)]
+
+    def cancel(self, booking_id: int) -> Dict:
+        try:
+            booking = self.store.cancel_booking(booking_id)
+        except KeyError:
+            raise NotFoundError(f"Booking {booking_id} not found")
+        self._refresh_seats(booking["Flight ID"])
+        return booking
+
+    def edit(self, flight_id: str, changes: Dict) -> Dict:
+        """Apply edits given as entered in the edit form (strings are parsed)."""
+        self.get_flight(flight_id)
+        parsed = parse_flight_changes(changes)
+        self.store.update_flight(flight_id, parsed)
+        self._update_catalog(flight_id, parsed)
+        return parsed
+
+    def _refresh_seats(self, flight_id: str) -> None:
+        # Re-read the count rather than adding one: the store is the truth.
+        # Seat counts are not indexed, so the cached row is updated in place
+        # (one assignment, safe alongside searches on other threads).
+        cached = self.catalog.get(flight_id) if self.catalog is not None else None
+        if cached is not None:
+            flight = self.store.get_flight(flight_id)
+            if flight is not None:
+                cached["Occupied Seats"] = flight["Occupied Seats"]
+
+    def _update_catalog(self, flight_id: str, changes: Dict) -> None:
+        if self.finder is not None:
+            self.finder.update(flight_id, changes)
+        elif self.catalog is not None:
+            self.catalog.update(flight_id, changes)
+
+
+def _day_start(day: str) -> int:
+    # Scheduled Time is a UTC Unix timestamp
+    try:
+        return int(datetime.strptime(day.strip(), "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+    except ValueError:
+        raise BookingError(f"Invalid date {day!r}. Expected format: YYYY-MM-DD")
+
+
+def _booking_date(value: str) -> datetime:
+    # Only ISO dates: 01/12/2024 could be either January or December
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        raise BookingError(f"Invalid booking date {value!r}. Expected format: YYYY-MM-DD HH:MM:SS")
+
+
+def parse_flight_changes(changes: Dict) -> Dict:
+    """Convert edit-form values to stored types; raises ValueError naming the field."""
+    parsed = {}
+    for field, value in changes.items():
+        if field not in EDITABLE_FIELDS:
+            raise ValueError(f"{field} cannot be edited")
+        if isinstance(value, str):
+            value = value.strip()
+        if field == "Scheduled Time" and isinstance(value, str):
+            try:
+                value = int(pd.to_datetime(value, format=DATE_FORMAT).timestamp())
+            except ValueError:
+                raise ValueError(f"Invalid date format for {field}. Expected format: YYYY-MM-DD HH:MM:SS")
+        elif field in INTEGER_FIELDS or field == "Scheduled Time":
+            # int() would truncate 0.5 to 0 and take True as 1
+            if isinstance(value, bool) or not isinstance(value, (int, str)):
+                raise ValueError(f"Invalid input for {field}: expected a whole number")
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError(f"Invalid input for {field}: expected a whole number")
+        elif not isinstance(value, str):
+            raise ValueError(f"Invalid input for {field}: expected text")
+        parsed[field] = value
+    return parsed
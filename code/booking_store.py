@@ -0,0 +1,769 @@
+# Storage backends for flight and booking data.
+# The application talks to a BookingStore instead of reading and rewriting
+# the Excel workbooks directly. SQLite is the default backend; the Excel
+# workbooks are still supported as an import/export format.
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from history_stream import CHUNK_SIZE, iter_workbook_chunks
+from seat_map import SeatMap
+from workbook_cache import file_signature, read_workbook, write_workbook
+
+FLIGHT_COLUMNS = [
+    "Airline Name", "Flight ID", "From Destination", "To Destination",
+    "Scheduled Time", "Status", "Max Seats", "Occupied Seats", "Price"
+]
+
+HISTORY_COLUMNS = [
+    "Booking Date", "Airline Name", "Flight ID", "From Destination",
+    "To Destination", "Scheduled Time", "Price", "Seat",
+    "User Name", "User Address", "User Phone", "User ID"
+]
+
+# Display column name -> SQL column name
+FLIGHT_FIELDS: Dict[str, str] = {name: name.lower().replace(" ", "_") for name in FLIGHT_COLUMNS}
+HISTORY_FIELDS: Dict[str, str] = {name: name.lower().replace(" ", "_") for name in HISTORY_COLUMNS}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    flight_id TEXT,
+    airline_name TEXT,
+    from_destination TEXT,
+    to_destination TEXT,
+    scheduled_time INTEGER,
+    status TEXT,
+    max_seats INTEGER,
+    occupied_seats INTEGER,
+    price INTEGER
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    booking_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    booking_date TEXT,
+    airline_name TEXT,
+    flight_id TEXT,
+    from_destination TEXT,
+    to_destination TEXT,
+    scheduled_time TEXT,
+    price INTEGER,
+    seat TEXT,
+    user_name TEXT,
+    user_address TEXT,
+    user_phone TEXT,
+    user_id TEXT
+);
+-- flights.xlsx does not guarantee unique Flight IDs, so this is not a key
+CREATE INDEX IF NOT EXISTS flights_flight_id ON flights (flight_id);
+CREATE INDEX IF NOT EXISTS bookings_flight_id ON bookings (flight_id);
+-- Seat bitmap (seat_map.SeatMap) of the bookable row of each flight,
+-- written in the same transaction as the booking that changes it
+CREATE TABLE IF NOT EXISTS seat_maps (
+    flight_id TEXT PRIMARY KEY,
+    max_seats INTEGER NOT NULL,
+    taken BLOB NOT NULL
+);
+-- Size and mtime of each workbook when it was last imported or exported
+CREATE TABLE IF NOT EXISTS workbook_sync (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER
+);
+-- Aggregates maintained in the same transaction as each booking
+CREATE TABLE IF NOT EXISTS stats_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    bookings INTEGER NOT NULL,
+    revenue INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats_daily (
+    day TEXT PRIMARY KEY,
+    bookings INTEGER NOT NULL,
+    revenue INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats_route (
+    from_destination TEXT,
+    to_destination TEXT,
+    bookings INTEGER NOT NULL,
+    revenue INTEGER NOT NULL,
+    PRIMARY KEY (from_destination, to_destination)
+);
+CREATE TABLE IF NOT EXISTS stats_airline (
+    airline_name TEXT PRIMARY KEY,
+    bookings INTEGER NOT NULL,
+    revenue INTEGER NOT NULL
+);
+-- Analytics cube: month (YYYY-MM) x destination x airline
+CREATE TABLE IF NOT EXISTS stats_cube (
+    month TEXT,
+    to_destination TEXT,
+    airline_name TEXT,
+    bookings INTEGER NOT NULL,
+    revenue INTEGER NOT NULL,
+    PRIMARY KEY (month, to_destination, airline_name)
+);
+-- Bumped whenever the aggregates change, so rendered charts can be cached
+CREATE TABLE IF NOT EXISTS stats_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+"""
+
+# Trigram full-text index over the searchable user fields. Trigrams give
+# case-insensitive substring matching for terms of three or more characters.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE booking_search USING fts5(
+    user_name, user_phone, user_id,
+    content='bookings', content_rowid='booking_id', tokenize='trigram'
+);
+CREATE TRIGGER bookings_search_insert AFTER INSERT ON bookings BEGIN
+    INSERT INTO booking_search (rowid, user_name, user_phone, user_id)
+    VALUES (new.booking_id, new.user_name, new.user_phone, new.user_id);
+END;
+CREATE TRIGGER bookings_search_delete AFTER DELETE ON bookings BEGIN
+    INSERT INTO booking_search (booking_search, rowid, user_name, user_phone, user_id)
+    VALUES ('delete', old.booking_id, old.user_name, old.user_phone, old.user_id);
+END;
+INSERT INTO booking_search (booking_search) VALUES ('rebuild');
+"""
+
+SEARCH_FIELDS = ["User Name", "User Phone", "User ID"]
+
+# Each statement adds one booking to an aggregate: (bookings, revenue, *key)
+_UPDATE_STATS = [
+    "INSERT INTO stats_totals (id, bookings, revenue) VALUES (1, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET bookings = bookings + excluded.bookings, revenue = revenue + excluded.revenue",
+    "INSERT INTO stats_daily (bookings, revenue, day) VALUES (?, ?, ?) "
+    "ON CONFLICT (day) DO UPDATE SET bookings = bookings + excluded.bookings, revenue = revenue + excluded.revenue",
+    "INSERT INTO stats_route (bookings, revenue, from_destination, to_destination) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (from_destination, to_destination) DO UPDATE SET "
+    "bookings = bookings + excluded.bookings, revenue = revenue + excluded.revenue",
+    "INSERT INTO stats_airline (bookings, revenue, airline_name) VALUES (?, ?, ?) "
+    "ON CONFLICT (airline_name) DO UPDATE SET bookings = bookings + excluded.bookings, revenue = revenue + excluded.revenue",
+    "INSERT INTO stats_cube (bookings, revenue, month, to_destination, airline_name) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (month, to_destination, airline_name) DO UPDATE SET "
+    "bookings = bookings + excluded.bookings, revenue = revenue + excluded.revenue",
+]
+
+_BUMP_STATS_VERSION = (
+    "INSERT INTO stats_version (id, version) VALUES (1, 1) "
+    "ON CONFLICT (id) DO UPDATE SET version = version + 1"
+)
+
+_REBUILD_STATS = """
+DELETE FROM stats_totals;
+DELETE FROM stats_daily;
+DELETE FROM stats_route;
+DELETE FROM stats_airline;
+DELETE FROM stats_cube;
+INSERT INTO stats_totals SELECT 1, COUNT(*), COALESCE(SUM(price), 0) FROM bookings;
+INSERT INTO stats_daily SELECT substr(booking_date, 1, 10), COUNT(*), SUM(price) FROM bookings GROUP BY 1;
+INSERT INTO stats_route SELECT from_destination, to_destination, COUNT(*), SUM(price) FROM bookings GROUP BY 1, 2;
+INSERT INTO stats_airline SELECT airline_name, COUNT(*), SUM(price) FROM bookings GROUP BY 1;
+INSERT INTO stats_cube SELECT substr(booking_date, 1, 7), to_destination, airline_name, COUNT(*), SUM(price)
+    FROM bookings GROUP BY 1, 2, 3;
+"""
+
+
+class SeatUnavailableError(Exception):
+    """Raised when a flight has no free seat (or does not exist)."""
+
+
+class BookingStore:
+    """Interface shared by all storage backends."""
+
+    def read_flights(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def read_flight_history(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def iter_history_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """The booking history as DataFrames of at most chunk_size rows,
+        for aggregations that should not hold every booking in memory."""
+        raise NotImplementedError
+
+    def read_history_page(self, after: int, limit: int) -> List[Tuple]:
+        """Return up to limit bookings whose key is greater than after.
+
+        Each row is (key, *values in HISTORY_COLUMNS order); pass the last
+        key back in to fetch the next page.
+        """
+        raise NotImplementedError
+
+    def count_bookings(self) -> int:
+        raise NotImplementedError
+
+    def history_key_at(self, position: int) -> int:
+        """The after key for read_history_page that starts the page at the
+        booking in this 0-based position, for jumping into the history."""
+        raise NotImplementedError
+
+    def search_bookings(self, term: str, after: int, limit: int) -> List[Tuple]:
+        """Page through bookings whose User Name, User Phone or User ID
+        contains term (case-insensitive). Rows are shaped like
+        read_history_page.
+        """
+        raise NotImplementedError
+
+    def read_statistics(self) -> Dict:
+        """Return total bookings/revenue and revenue per day, route and airline.
+
+        daily_revenue is a list of (YYYY-MM-DD, revenue) in date order,
+        route_revenue of (from, to, bookings, revenue) and airline_revenue
+        of (airline, bookings, revenue).
+        """
+        raise NotImplementedError
+
+    def analytics_version(self):
+        """A value that changes whenever the bookings (and so the analytics
+        cube) change; use it as a cache key for anything derived from them."""
+        raise NotImplementedError
+
+    def read_analytics_cube(self) -> List[Tuple]:
+        """Bookings and revenue as (month YYYY-MM, destination, airline,
+        bookings, revenue) rows."""
+        raise NotImplementedError
+
+    def get_flight(self, flight_id: str) -> Optional[Dict]:
+        """The first flight row with this Flight ID, or None."""
+        raise NotImplementedError
+
+    def get_booking(self, booking_id: int) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def book(self, booking: Dict, seat_preference: Optional[str] = None) -> int:
+        """Take one seat and append the booking in one transaction.
+
+        If booking["Seat"] is empty a free seat is allocated from the
+        flight's seat map (window, middle or aisle first if preferred) and
+        written into booking["Seat"]. Returns the new booking's key (as
+        used by read_history_page). Raises SeatUnavailableError instead of
+        overselling Max Seats or double-booking a seat.
+        """
+        raise NotImplementedError
+
+    def book_party(self, bookings: List[Dict]) -> List[int]:
+        """Book several people on one flight in side-by-side seats.
+
+        All bookings must share a Flight ID. The seats are taken from one
+        row of the flight's seat map and written into each booking["Seat"]
+        in a single transaction; returns the new bookings' keys. Raises
+        SeatUnavailableError, booking nobody, if no row has enough
+        adjacent free seats.
+        """
+        raise NotImplementedError
+
+    def book_many(self, bookings: List[Dict]) -> List[Optional[str]]:
+        """Book a batch, taking as many seats per flight as are free.
+
+        Returns one entry per booking: None if it was saved (with its Seat
+        filled in), otherwise the reason it was rejected. Bookings are
+        granted in input order.
+        """
+        raise NotImplementedError
+
+    def cancel_booking(self, booking_id: int) -> Dict:
+        """Delete a booking and free its seat; returns the removed booking.
+
+        Raises KeyError if there is no such booking.
+        """
+        raise NotImplementedError
+
+    def increment_occupied_seat(self, flight_id: str) -> None:
+        """Take one seat, raising SeatUnavailableError if the flight is full."""
+        raise NotImplementedError
+
+    def update_flight(self, flight_id: str, changes: Dict) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteBookingStore(BookingStore):
+    """Embedded SQLite store in WAL mode.
+
+    Bookings are append-only inserts and seat updates touch a single row,
+    so the cost of a booking does not grow with the size of the history.
+    Seats are counted and assigned from the flight's seat map inside a
+    BEGIN IMMEDIATE transaction, so concurrent bookers in any number of
+    processes can never oversell or get the same seat.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        # sqlite3 connections cannot be shared between threads, so each
+        # thread (e.g. the background I/O worker) gets its own
+        self.local = threading.local()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.has_search_index = self._create_search_index()
+        if self.conn.execute("SELECT COUNT(*) FROM stats_version").fetchone()[0] == 0:
+            # Database created before the aggregates (or the cube) existed
+            with self._transaction():
+                self._rebuild_statistics()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0] == 0
+
+    def read_flights(self) -> pd.DataFrame:
+        sql_columns = ", ".join(FLIGHT_FIELDS.values())
+        df = pd.read_sql_query(f"SELECT {sql_columns} FROM flights ORDER BY rowid", self.conn)
+        df.columns = FLIGHT_COLUMNS
+        return df
+
+    def read_flight_history(self) -> pd.DataFrame:
+        sql_columns = ", ".join(HISTORY_FIELDS.values())
+        df = pd.read_sql_query(f"SELECT {sql_columns} FROM bookings ORDER BY booking_id", self.conn)
+        df.columns = HISTORY_COLUMNS
+        return df
+
+    def iter_history_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        sql_columns = ", ".join(HISTORY_FIELDS.values())
+        for chunk in pd.read_sql_query(f"SELECT {sql_columns} FROM bookings ORDER BY booking_id",
+                                       self.conn, chunksize=chunk_size):
+            chunk.columns = HISTORY_COLUMNS
+            yield chunk
+
+    def read_history_page(self, after: int, limit: int) -> List[Tuple]:
+        # Keyset pagination: cost depends on the page size, not the offset
+        sql_columns = ", ".join(HISTORY_FIELDS.values())
+        return self.conn.execute(
+            f"SELECT booking_id, {sql_columns} FROM bookings "
+            "WHERE booking_id > ? ORDER BY booking_id LIMIT ?",
+            (after, limit)
+        ).fetchall()
+
+    def count_bookings(self) -> int:
+        return self.conn.execute("SELECT bookings FROM stats_totals").fetchone()[0]
+
+    def history_key_at(self, position: int) -> int:
+        if position <= 0:
+            return 0
+        # Walks the primary key index, without reading the rows
+        row = self.conn.execute(
+            "SELECT booking_id FROM bookings ORDER BY booking_id LIMIT 1 OFFSET ?", (position - 1,)
+        ).fetchone()
+        return row[0] if row else self.conn.execute("SELECT coalesce(max(booking_id), 0) FROM bookings").fetchone()[0]
+
+    def search_bookings(self, term: str, after: int, limit: int) -> List[Tuple]:
+        sql_columns = ", ".join(f"b.{col}" for col in HISTORY_FIELDS.values())
+        if self.has_search_index and len(term) >= 3:
+            # Quote the term so FTS5 treats it as one phrase
+            query = '"' + term.replace('"', '""') + '"'
+            return self.conn.execute(
+                f"SELECT b.booking_id, {sql_columns} FROM booking_search "
+                "JOIN bookings b ON b.booking_id = booking_search.rowid "
+                "WHERE booking_search MATCH ? AND booking_search.rowid > ? "
+                "ORDER BY booking_search.rowid LIMIT ?",
+                (query, after, limit)
+            ).fetchall()
+
+        # Short terms cannot use trigrams; scan in key order until the page fills
+        pattern = "%" + term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions = " OR ".join(
+            f"lower(b.{HISTORY_FIELDS[col]}) LIKE ? ESCAPE '\\'" for col in SEARCH_FIELDS
+        )
+        return self.conn.execute(
+            f"SELECT b.booking_id, {sql_columns} FROM bookings b "
+            f"WHERE b.booking_id > ? AND ({conditions}) ORDER BY b.booking_id LIMIT ?",
+            (after, *[pattern] * len(SEARCH_FIELDS), limit)
+        ).fetchall()
+
+    def read_statistics(self) -> Dict:
+        total_bookings, total_revenue = self.conn.execute(
+            "SELECT bookings, revenue FROM stats_totals"
+        ).fetchone()
+        return {
+            "total_bookings": total_bookings,
+            "total_revenue": total_revenue,
+            "daily_revenue": self.conn.execute(
+                "SELECT day, revenue FROM stats_daily ORDER BY day").fetchall(),
+            "route_revenue": self.conn.execute(
+                "SELECT from_destination, to_destination, bookings, revenue FROM stats_route "
+                "ORDER BY revenue DESC").fetchall(),
+            "airline_revenue": self.conn.execute(
+                "SELECT airline_name, bookings, revenue FROM stats_airline ORDER BY revenue DESC").fetchall(),
+        }
+
+    def analytics_version(self):
+        return self.conn.execute("SELECT version FROM stats_version").fetchone()[0]
+
+    def read_analytics_cube(self) -> List[Tuple]:
+        return self.conn.execute(
+            "SELECT month, to_destination, airline_name, bookings, revenue FROM stats_cube ORDER BY 1, 2, 3"
+        ).fetchall()
+
+    def get_flight(self, flight_id: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            f"SELECT {', '.join(FLIGHT_FIELDS.values())} FROM flights "
+            "WHERE flight_id = ? ORDER BY rowid LIMIT 1",
+            (flight_id,)
+        ).fetchone()
+        return dict(zip(FLIGHT_COLUMNS, row)) if row else None
+
+    def get_booking(self, booking_id: int) -> Optional[Dict]:
+        row = self.conn.execute(
+            f"SELECT {', '.join(HISTORY_FIELDS.values())} FROM bookings WHERE booking_id = ?",
+            (booking_id,)
+        ).fetchone()
+        return dict(zip(HISTORY_COLUMNS, row)) if row else None
+
+    def book(self, booking: Dict, seat_preference: Optional[str] = None) -> int:
+        with self._transaction():
+            booking["Seat"] = self._reserve_seat(booking["Flight ID"], booking.get("Seat"), seat_preference)
+            return self._insert_booking(booking)
+
+    def book_party(self, bookings: List[Dict]) -> List[int]:
+        flight_ids = {booking["Flight ID"] for booking in bookings}
+        if len(flight_ids) != 1:
+            raise ValueError("A party must book a single flight")
+        flight_id = flight_ids.pop()
+        with self._transaction():
+            row = self._bookable_flight(flight_id)
+            if row is None or row[2] + len(bookings) > row[1]:
+                raise SeatUnavailableError(f"Not enough seats available on flight {flight_id}")
+            seat_map = self._load_seat_map(flight_id, *row[1:])
+            seats = seat_map.allocate_adjacent(len(bookings))
+            if seats is None:
+                raise SeatUnavailableError(f"No {len(bookings)} adjacent seats available on flight {flight_id}")
+            self.conn.execute(
+                "UPDATE flights SET occupied_seats = occupied_seats + ? WHERE rowid = ?", (len(bookings), row[0])
+            )
+            self._save_seat_map(flight_id, seat_map)
+            booking_ids = []
+            for booking, seat in zip(bookings, seats):
+                booking["Seat"] = seat
+                booking_ids.append(self._insert_booking(booking))
+            return booking_ids
+
+    def book_many(self, bookings: List[Dict]) -> List[Optional[str]]:
+        with self._transaction():
+            # Each flight's seat map is loaded once and saved once per batch,
+            # with one seat count update per flight, not per booking
+            flights = {}
+            results = []
+            accepted = []
+            for booking in bookings:
+                flight_id = booking["Flight ID"]
+                if flight_id not in flights:
+                    row = self._bookable_flight(flight_id)
+                    flights[flight_id] = row and [row[0], self._load_seat_map(flight_id, *row[1:]), 0]
+                state = flights[flight_id]
+                if state is None:
+                    results.append("Flight ID not found")
+                    continue
+                try:
+                    booking["Seat"] = _assign_seat(state[1], booking.get("Seat"))
+                except SeatUnavailableError as e:
+                    results.append(str(e))
+                    continue
+                state[2] += 1
+                accepted.append(booking)
+                results.append(None)
+
+            for flight_id, state in flights.items():
+                if state and state[2]:
+                    rowid, seat_map, taken = state
+                    self.conn.execute(
+                        "UPDATE flights SET occupied_seats = occupied_seats + ? WHERE rowid = ?", (taken, rowid)
+                    )
+                    self._save_seat_map(flight_id, seat_map)
+
+            self.conn.executemany(
+                _INSERT_BOOKING,
+                [[_to_sql(booking.get(col)) for col in HISTORY_COLUMNS] for booking in accepted]
+            )
+            self._add_many_to_statistics(accepted, 1)
+            return results
+
+    def cancel_booking(self, booking_id: int) -> Dict:
+        with self._transaction():
+            booking = self.get_booking(booking_id)
+            if booking is None:
+                raise KeyError(booking_id)
+            self.conn.execute("DELETE FROM bookings WHERE booking_id = ?", (booking_id,))
+            self.conn.execute(
+                "UPDATE flights SET occupied_seats = occupied_seats - 1 "
+                "WHERE rowid = (SELECT rowid FROM flights WHERE flight_id = ? ORDER BY rowid LIMIT 1) "
+                "AND occupied_seats > 0",
+                (booking["Flight ID"],)
+            )
+            self._release_seat(booking["Flight ID"], booking["Seat"])
+            self._add_to_statistics(booking, -1)
+            return booking
+
+    def increment_occupied_seat(self, flight_id: str) -> None:
+        with self._transaction():
+            self._reserve_seat(flight_id)
+
+    def update_flight(self, flight_id: str, changes: Dict) -> None:
+        if not changes:
+            return
+        assignments = ", ".join(f"{FLIGHT_FIELDS[field]} = ?" for field in changes)
+        with self._transaction():
+            self.conn.execute(
+                f"UPDATE flights SET {assignments} WHERE flight_id = ?",
+                [*changes.values(), flight_id]
+            )
+
+    def import_excel(self, flights_file: str, history_file: Optional[str] = None) -> None:
+        """Replace the store contents with the given workbooks. Any booking
+        not in the workbooks is lost; open_store only seeds an empty store."""
+        flights = read_workbook(flights_file)
+        # The history is streamed in, so importing years of bookings
+        # never holds the whole workbook in memory
+        chunks = iter_workbook_chunks(history_file) if history_file and os.path.exists(history_file) else ()
+        with self._transaction():
+            self._replace_contents(flights, chunks)
+            self._record_workbooks(flights_file, history_file)
+
+    def replace_contents(self, flights: pd.DataFrame, history_chunks: Iterable[pd.DataFrame] = ()) -> None:
+        """Replace the store contents with flights and the history, given as
+        DataFrame chunks (e.g. generated data rather than workbooks)."""
+        with self._transaction():
+            self._replace_contents(flights, history_chunks)
+
+    def export_excel(self, flights_file: str, history_file: str) -> None:
+        write_workbook(self.read_flights(), flights_file)
+        write_workbook(self.read_flight_history(), history_file)
+        with self._transaction():
+            self._record_workbooks(flights_file, history_file)
+
+    def workbooks_changed(self, flights_file: str, history_file: str) -> bool:
+        """True if either workbook differs from the last import/export,
+        i.e. it was edited outside the app."""
+        for path in [flights_file, history_file]:
+            row = self.conn.execute(
+                "SELECT mtime_ns, size FROM workbook_sync WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+            signature = file_signature(path)
+            if signature is not None and (row is None or tuple(row) != signature):
+                return True
+        return False
+
+    def close(self) -> None:
+        # Only closes the calling thread's connection
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    def _transaction(self):
+        return _Transaction(self.conn)
+
+    def _replace_contents(self, flights: pd.DataFrame, history_chunks: Iterable[pd.DataFrame]) -> None:
+        self.conn.execute("DELETE FROM flights")
+        self.conn.execute("DELETE FROM bookings")
+        self.conn.execute("DELETE FROM seat_maps")
+        self.conn.executemany(
+            f"INSERT INTO flights ({', '.join(FLIGHT_FIELDS.values())}) "
+            f"VALUES ({', '.join('?' * len(FLIGHT_FIELDS))})",
+            _records(flights, FLIGHT_COLUMNS)
+        )
+        for chunk in history_chunks:
+            self.conn.executemany(_INSERT_BOOKING, _records(_history_as_text(chunk), HISTORY_COLUMNS))
+        self._rebuild_statistics()
+
+    def _record_workbooks(self, *paths: str) -> None:
+        for path in paths:
+            signature = file_signature(path) if path else None
+            if signature is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO workbook_sync (path, mtime_ns, size) VALUES (?, ?, ?)",
+                    (os.path.abspath(path), *signature)
+                )
+
+    def _create_search_index(self) -> bool:
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'booking_search'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            self.conn.executescript(f"BEGIN; {SEARCH_SCHEMA} COMMIT;")
+            return True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or the trigram tokenizer (< 3.34)
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            return False
+
+    def _insert_booking(self, booking: Dict) -> int:
+        cursor = self.conn.execute(_INSERT_BOOKING, [_to_sql(booking.get(col)) for col in HISTORY_COLUMNS])
+        self._add_to_statistics(booking, 1)
+        return cursor.lastrowid
+
+    def _add_to_statistics(self, booking: Dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one booking from the aggregates."""
+        self._add_many_to_statistics([booking], sign)
+
+    def _add_many_to_statistics(self, bookings: List[Dict], sign: int) -> None:
+        # Sum the batch per aggregate key first: one upsert per key
+        totals: List[Dict[Tuple, List[int]]] = [{} for _ in _UPDATE_STATS]
+        for booking in bookings:
+            revenue = sign * int(_to_sql(booking["Price"]))
+            for aggregate, key in zip(totals, _statistics_keys(booking)):
+                total = aggregate.setdefault(key, [0, 0])
+                total[0] += sign
+                total[1] += revenue
+        for sql, aggregate in zip(_UPDATE_STATS, totals):
+            self.conn.executemany(sql, [(count, revenue, *key) for key, (count, revenue) in aggregate.items()])
+        if sign < 0:
+            # Cancelled bookings should not leave empty days, routes, airlines
+            # or destinations in the charts and top lists
+            for table in ("stats_daily", "stats_route", "stats_airline", "stats_cube"):
+                self.conn.execute(f"DELETE FROM {table} WHERE bookings = 0")
+        self.conn.execute(_BUMP_STATS_VERSION)
+
+    def _rebuild_statistics(self) -> None:
+        for statement in _REBUILD_STATS.strip().split(";"):
+            if statement.strip():
+                self.conn.execute(statement)
+        self.conn.execute(_BUMP_STATS_VERSION)
+
+    def _reserve_seat(self, flight_id: str, seat: Optional[str] = None,
+                      preference: Optional[str] = None) -> str:
+        row = self._bookable_flight(flight_id)
+        if row is None or row[2] >= row[1]:
+            raise SeatUnavailableError(f"No seats available on flight {flight_id}")
+        seat_map = self._load_seat_map(flight_id, *row[1:])
+        label = _assign_seat(seat_map, seat, preference)
+        self.conn.execute("UPDATE flights SET occupied_seats = occupied_seats + 1 WHERE rowid = ?", (row[0],))
+        self._save_seat_map(flight_id, seat_map)
+        return label
+
+    def _bookable_flight(self, flight_id: str) -> Optional[Tuple[int, int, int]]:
+        # Only the first row for a Flight ID is bookable, as in the GUI lookup
+        return self.conn.execute(
+            "SELECT rowid, max_seats, occupied_seats FROM flights WHERE flight_id = ? ORDER BY rowid LIMIT 1",
+            (flight_id,)
+        ).fetchone()
+
+    def _load_seat_map(self, flight_id: str, max_seats: int, occupied: int) -> SeatMap:
+        row = self.conn.execute(
+            "SELECT max_seats, taken FROM seat_maps WHERE flight_id = ?", (flight_id,)
+        ).fetchone()
+        if row is not None and row[0] == max_seats:
+            seat_map = SeatMap.from_bytes(max_seats, row[1])
+            if seat_map.taken_count() == min(occupied, max_seats):
+                return seat_map
+        # No map yet, or out of step after Max/Occupied Seats were edited
+        seats = self.conn.execute(
+            "SELECT seat FROM bookings WHERE flight_id = ? ORDER BY booking_id", (flight_id,)
+        )
+        return SeatMap.from_seats(max_seats, occupied, (seat for seat, in seats))
+
+    def _save_seat_map(self, flight_id: str, seat_map: SeatMap) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO seat_maps (flight_id, max_seats, taken) VALUES (?, ?, ?)",
+            (flight_id, seat_map.max_seats, seat_map.to_bytes())
+        )
+
+    def _release_seat(self, flight_id: str, seat: str) -> None:
+        row = self.conn.execute(
+            "SELECT max_seats, taken FROM seat_maps WHERE flight_id = ?", (flight_id,)
+        ).fetchone()
+        if row is not None:
+            seat_map = SeatMap.from_bytes(*row)
+            # A seat missing from the map leaves it out of step with
+            # occupied_seats, and _load_seat_map rebuilds it
+            if seat_map.release(seat):
+                self._save_seat_map(flight_id, seat_map)
+
+
+_INSERT_BOOKING = (
+    f"INSERT INTO bookings ({', '.join(HISTORY_FIELDS.values())}) "
+    f"VALUES ({', '.join('?' * len(HISTORY_FIELDS))})"
+)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back if the block raises."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+
+def _assign_seat(seat_map: SeatMap, seat: Optional[str] = None, preference: Optional[str] = None) -> str:
+    """Take the requested seat, or allocate one; raises SeatUnavailableError."""
+    if seat:
+        try:
+            return seat_map.take(seat)
+        except ValueError as e:
+            raise SeatUnavailableError(str(e))
+    label = seat_map.allocate(preference)
+    if label is None:
+        raise SeatUnavailableError("No seats available")
+    return label
+
+
+def _statistics_keys(booking: Dict) -> List[Tuple]:
+    """Keys of the booking in each aggregate, in _UPDATE_STATS order."""
+    return [
+        (),
+        (str(_to_sql(booking["Booking Date"]))[:10],),
+        (booking["From Destination"], booking["To Destination"]),
+        (booking["Airline Name"],),
+        (str(_to_sql(booking["Booking Date"]))[:7], booking["To Destination"], booking["Airline Name"]),
+    ]
+
+
+def _to_sql(value):
+    # numpy scalars and timestamps are not understood by sqlite3
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def _records(df: pd.DataFrame, columns: List[str]) -> List[list]:
+    return [[_to_sql(value) for value in row] for row in df[columns].itertuples(index=False)]
+
+
+def _history_as_text(history: pd.DataFrame) -> pd.DataFrame:
+    from table_format import format_history_frame
+    history = format_history_frame(history)
+    history["User Phone"] = history["User Phone"].astype(str)
+    return history
+
+
+def open_store(db_file: str, flights_file: str, history_file: str) -> BookingStore:
+    """Open the SQLite store, seeding it from the workbooks on first use.
+
+    The database is the source of truth once seeded: workbooks edited
+    outside the app are reported, never imported over the bookings saved
+    since the last export.
+    """
+    store = SQLiteBookingStore(db_file)
+    if not os.path.exists(flights_file):
+        return store
+    if store.is_empty():
+        store.import_excel(flights_file, history_file)
+    elif store.workbooks_changed(flights_file, history_file):
+        print(f"Warning: {flights_file} or {history_file} changed since the last export; "
+              f"keeping the bookings in {db_file}. The workbooks are rewritten on the next export.")
+    return store
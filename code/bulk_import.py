@@ -0,0 +1,175 @@
+# Bulk booking import and export.
+# Streams bookings from partner CSV or JSONL feeds in fixed-size batches,
+# so memory use does not depend on the size of the input. Each batch is
+# validated against the flight catalog, seats are reserved per flight in
+# one transaction and the accepted rows are appended together. Rejected
+# rows are written to a CSV report with the reason.
+#
+# Usage: python bulk_import.py import <bookings.csv|.jsonl> [--rejects rejects.csv]
+#        python bulk_import.py export <bookings.csv|.jsonl>
+import argparse
+import csv
+import json
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from booking_service import BookingError, BookingService
+from booking_store import HISTORY_COLUMNS, BookingStore, open_store
+
+FlightInformationFile = "flights.xlsx"
+FlightHistoryFile = "flight_history.xlsx"
+FlightDatabaseFile = "flights.db"
+
+BATCH_SIZE = 5000
+
+# Accepted spellings for each input field
+INPUT_FIELDS = {
+    "flight_id": ["Flight ID", "flight_id"],
+    "user_name": ["User Name", "user_name"],
+    "user_address": ["User Address", "user_address"],
+    "user_phone": ["User Phone", "user_phone"],
+    "user_id": ["User ID", "user_id"],
+    "seat": ["Seat", "seat"],
+    "booking_date": ["Booking Date", "booking_date"],
+}
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line number, row) from a CSV or JSONL file, one at a time."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl") or path.endswith(".ndjson"):
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, {"_error": f"Invalid JSON: {e}"}
+                    continue
+                if not isinstance(row, dict):
+                    row = {"_error": "Row must be a JSON object"}
+                yield line_number, row
+        else:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+
+
+def batches(rows: Iterator, size: int) -> Iterator[List]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def field(row: Dict, name: str) -> Optional[str]:
+    for key in INPUT_FIELDS[name]:
+        value = row.get(key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+class BulkImporter:
+    def __init__(self, store: BookingStore, batch_size: int = BATCH_SIZE):
+        self.service = BookingService(store)
+        self.store = store
+        self.batch_size = batch_size
+        self.accepted = 0
+        self.rejected = 0
+
+    def run(self, path: str, rejects_path: Optional[str] = None) -> None:
+        catalog = self.service.refresh()
+        rejects_file = open(rejects_path, "w", newline="", encoding="utf-8") if rejects_path else None
+        rejects = csv.writer(rejects_file) if rejects_file else None
+        if rejects:
+            rejects.writerow(["line", "reason", "row"])
+
+        try:
+            for batch in batches(read_rows(path), self.batch_size):
+                valid = []
+                for line_number, row in batch:
+                    try:
+                        valid.append((line_number, row, self._to_booking(row, catalog)))
+                    except BookingError as e:
+                        self._reject(rejects, line_number, str(e), row)
+
+                results = self.store.book_many([booking for _, _, booking in valid])
+                for (line_number, row, _), reason in zip(valid, results):
+                    if reason is None:
+                        self.accepted += 1
+                    else:
+                        self._reject(rejects, line_number, reason, row)
+        finally:
+            if rejects_file:
+                rejects_file.close()
+
+    def _to_booking(self, row: Dict, catalog) -> Dict:
+        if "_error" in row:
+            raise BookingError(row["_error"])
+        flight_id = field(row, "flight_id") or ""
+        flight = catalog.get(flight_id)
+        if flight is None:
+            raise BookingError("Flight ID not found")
+        return self.service.new_booking(
+            flight_id, field(row, "user_name") or "", field(row, "user_address") or "",
+            field(row, "user_phone") or "", field(row, "user_id") or "",
+            seat=field(row, "seat"), booking_date=field(row, "booking_date"), flight=flight,
+        )
+
+    def _reject(self, rejects, line_number: int, reason: str, row: Dict) -> None:
+        self.rejected += 1
+        if rejects:
+            rejects.writerow([line_number, reason, json.dumps(row, default=str)])
+
+
+def export_bookings(store: BookingStore, path: str, page_size: int = BATCH_SIZE) -> int:
+    """Stream the whole booking history to CSV or JSONL a page at a time."""
+    count = 0
+    after = 0
+    jsonl = path.endswith(".jsonl") or path.endswith(".ndjson")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = None if jsonl else csv.writer(f)
+        if writer:
+            writer.writerow(HISTORY_COLUMNS)
+        while True:
+            page = store.read_history_page(after, page_size)
+            if not page:
+                break
+            for key, *values in page:
+                if writer:
+                    writer.writerow(values)
+                else:
+                    f.write(json.dumps(dict(zip(HISTORY_COLUMNS, values)), default=str) + "\n")
+            count += len(page)
+            after = page[-1][0]
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk booking import/export")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help="CSV or JSONL (.jsonl) file")
+    parser.add_argument("--rejects", help="CSV report of rejected rows (import only)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--db", default=FlightDatabaseFile)
+    args = parser.parse_args()
+
+    store = open_store(args.db, FlightInformationFile, FlightHistoryFile)
+    start = time.perf_counter()
+    if args.command == "import":
+        importer = BulkImporter(store, args.batch_size)
+        importer.run(args.path, args.rejects)
+        print(f"Imported {importer.accepted} bookings, rejected {importer.rejected} "
+              f"in {time.perf_counter() - start:.1f}s")
+    else:
+        count = export_bookings(store, args.path, args.batch_size)
+        print(f"Exported {count} bookings in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
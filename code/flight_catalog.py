@@ -0,0 +1,76 @@
+# In-memory flight catalog keyed by Flight ID.
+# Replaces the boolean-mask scans (df[df["Flight ID"] == flight_id]) with
+# dictionary lookups, plus secondary indexes on route and status.
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class FlightCatalog:
+    def __init__(self, rows: Iterable[Dict] = ()):
+        self.flights: Dict[str, Dict] = {}
+        self.by_route_index: Dict[Tuple[str, str], Set[str]] = {}
+        self.by_origin_index: Dict[str, Set[str]] = {}
+        self.by_status_index: Dict[str, Set[str]] = {}
+        for row in rows:
+            self.add(row)
+
+    @classmethod
+    def from_dataframe(cls, df) -> "FlightCatalog":
+        return cls(df.to_dict("records"))
+
+    def add(self, row: Dict) -> None:
+        """Add a flight. Like the GUI lookup, the first row for an ID wins."""
+        flight_id = row["Flight ID"]
+        if flight_id in self.flights:
+            return
+        self.flights[flight_id] = dict(row)
+        self._index(flight_id)
+
+    def get(self, flight_id: str) -> Optional[Dict]:
+        return self.flights.get(flight_id)
+
+    def __contains__(self, flight_id: str) -> bool:
+        return flight_id in self.flights
+
+    def __len__(self) -> int:
+        return len(self.flights)
+
+    def by_route(self, from_destination: str, to_destination: str) -> List[Dict]:
+        ids = self.by_route_index.get((from_destination, to_destination), ())
+        return [self.flights[flight_id] for flight_id in ids]
+
+    def by_origin(self, from_destination: str) -> List[Dict]:
+        ids = self.by_origin_index.get(from_destination, ())
+        return [self.flights[flight_id] for flight_id in ids]
+
+    def by_status(self, status: str) -> List[Dict]:
+        ids = self.by_status_index.get(status, ())
+        return [self.flights[flight_id] for flight_id in ids]
+
+    def update(self, flight_id: str, changes: Dict) -> None:
+        """Apply an edit and move the flight between indexes if needed."""
+        if flight_id not in self.flights:
+            return
+        self._unindex(flight_id)
+        self.flights[flight_id].update(changes)
+        self._index(flight_id)
+
+    def _index(self, flight_id: str) -> None:
+        row = self.flights[flight_id]
+        route = (row["From Destination"], row["To Destination"])
+        self.by_route_index.setdefault(route, set()).add(flight_id)
+        self.by_origin_index.setdefault(row["From Destination"], set()).add(flight_id)
+        self.by_status_index.setdefault(row["Status"], set()).add(flight_id)
+
+    def _unindex(self, flight_id: str) -> None:
+        row = self.flights[flight_id]
+        route = (row["From Destination"], row["To Destination"])
+        for index, key in [
+            (self.by_route_index, route),
+            (self.by_origin_index, row["From Destination"]),
+            (self.by_status_index, row["Status"]),
+        ]:
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(flight_id)
+                if not ids:
+                    del index[key]
@@ -0,0 +1,179 @@
+# Flight search by route, departure window, price and free seats.
+# Each route (From, To) and each origin has its flights sorted by
+# Scheduled Time, so a date window is two bisects plus a walk over just the
+# matching flights. Connections chain route lookups through each
+# intermediate airport instead of scanning the whole catalog.
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flight_catalog import FlightCatalog
+
+# Flights have no arrival time, so a connection is a flight from the
+# intermediate airport departing this long after the previous leg departed
+MIN_CONNECTION = 2 * 3600
+MAX_CONNECTION = 24 * 3600
+MAX_RESULTS = 200
+
+
+class TimeIndex:
+    """Flight IDs sorted by departure time, with range lookups."""
+
+    def __init__(self, entries: Iterable[Tuple[int, str]] = ()):
+        self.entries: List[Tuple[int, str]] = sorted(entries)
+
+    def add(self, departure: int, flight_id: str) -> None:
+        insort(self.entries, (departure, flight_id))
+
+    def remove(self, departure: int, flight_id: str) -> None:
+        i = bisect_left(self.entries, (departure, flight_id))
+        if i < len(self.entries) and self.entries[i] == (departure, flight_id):
+            del self.entries[i]
+
+    def between(self, start: Optional[int], end: Optional[int]) -> Sequence[Tuple[int, str]]:
+        """Entries departing in [start, end]; None means unbounded."""
+        low = 0 if start is None else bisect_left(self.entries, (start, ""))
+        # chr(0x10FFFF) sorts after any Flight ID at the same time
+        high = len(self.entries) if end is None else bisect_right(self.entries, (end, chr(0x10FFFF)))
+        return self.entries[low:high]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class FlightSearch:
+    def __init__(self, catalog: FlightCatalog):
+        self.catalog = catalog
+        # Group first and sort each index once, rather than insort per flight
+        routes: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+        origins: Dict[str, List[Tuple[int, str]]] = {}
+        for flight_id, flight in catalog.flights.items():
+            entry = (int(flight["Scheduled Time"]), flight_id)
+            routes.setdefault((flight["From Destination"], flight["To Destination"]), []).append(entry)
+            origins.setdefault(flight["From Destination"], []).append(entry)
+        self.by_time = TimeIndex(entry for entries in origins.values() for entry in entries)
+        self.by_route = {route: TimeIndex(entries) for route, entries in routes.items()}
+        self.by_origin = {origin: TimeIndex(entries) for origin, entries in origins.items()}
+
+    def update(self, flight_id: str, changes: Dict) -> None:
+        """Apply an edit to the catalog and re-index the flight."""
+        if flight_id not in self.catalog:
+            return
+        self._unindex(flight_id)
+        self.catalog.update(flight_id, changes)
+        self._index(flight_id)
+
+    def search(self, from_destination: Optional[str] = None, to_destination: Optional[str] = None,
+               depart_after: Optional[int] = None, depart_before: Optional[int] = None,
+               min_price: Optional[int] = None, max_price: Optional[int] = None, seats: int = 1,
+               statuses: Optional[Iterable[str]] = None, limit: int = MAX_RESULTS) -> List[Dict]:
+        """Direct flights matching every given filter, earliest first.
+
+        Times are Unix timestamps (as in Scheduled Time); seats is the
+        number of free seats needed.
+        """
+        if from_destination and to_destination:
+            index = self.by_route.get((from_destination, to_destination))
+        elif from_destination:
+            index = self.by_origin.get(from_destination)
+        else:
+            index = self.by_time
+        if index is None:
+            return []
+
+        statuses = set(statuses) if statuses is not None else None
+        results = []
+        for _, flight_id in index.between(depart_after, depart_before):
+            flight = self.catalog.flights[flight_id]
+            if to_destination and flight["To Destination"] != to_destination:
+                continue
+            if _matches(flight, min_price, max_price, seats, statuses):
+                results.append(flight)
+                if len(results) == limit:
+                    break
+        return results
+
+    def connections(self, from_destination: str, to_destination: str,
+                    depart_after: Optional[int] = None, depart_before: Optional[int] = None,
+                    max_price: Optional[int] = None, seats: int = 1,
+                    statuses: Optional[Iterable[str]] = None, max_legs: int = 2,
+                    min_connection: int = MIN_CONNECTION, max_connection: int = MAX_CONNECTION,
+                    limit: int = MAX_RESULTS) -> List[List[Dict]]:
+        """Itineraries of 2 to max_legs flights, cheapest first.
+
+        Only the first leg has to depart inside the window; max_price
+        applies to the total fare.
+        """
+        statuses = set(statuses) if statuses is not None else None
+        itineraries = []
+
+        def extend(path: List[Dict], price: int) -> None:
+            last = path[-1]
+            here = last["To Destination"]
+            earliest = last["Scheduled Time"] + min_connection
+            latest = last["Scheduled Time"] + max_connection
+            visited = {flight["From Destination"] for flight in path}
+
+            # Final leg: straight to the destination
+            index = self.by_route.get((here, to_destination))
+            for _, flight_id in index.between(earliest, latest) if index else ():
+                flight = self.catalog.flights[flight_id]
+                if _matches(flight, None, _remaining(max_price, price), seats, statuses):
+                    itineraries.append((price + flight["Price"], path + [flight]))
+
+            # Another intermediate stop
+            if len(path) + 1 < max_legs:
+                index = self.by_origin.get(here)
+                for _, flight_id in index.between(earliest, latest) if index else ():
+                    flight = self.catalog.flights[flight_id]
+                    stop = flight["To Destination"]
+                    if stop == to_destination or stop in visited:
+                        continue
+                    if _matches(flight, None, _remaining(max_price, price), seats, statuses):
+                        extend(path + [flight], price + flight["Price"])
+
+        if max_legs >= 2:
+            origin = self.by_origin.get(from_destination)
+            for _, flight_id in origin.between(depart_after, depart_before) if origin else ():
+                flight = self.catalog.flights[flight_id]
+                if flight["To Destination"] == to_destination:
+                    continue  # direct flights come from search()
+                if _matches(flight, None, max_price, seats, statuses):
+                    extend([flight], flight["Price"])
+
+        itineraries.sort(key=lambda item: (item[0], item[1][0]["Scheduled Time"]))
+        return [legs for _, legs in itineraries[:limit]]
+
+    def _index(self, flight_id: str) -> None:
+        flight = self.catalog.flights[flight_id]
+        departure = int(flight["Scheduled Time"])
+        route = (flight["From Destination"], flight["To Destination"])
+        self.by_time.add(departure, flight_id)
+        self.by_route.setdefault(route, TimeIndex()).add(departure, flight_id)
+        self.by_origin.setdefault(flight["From Destination"], TimeIndex()).add(departure, flight_id)
+
+    def _unindex(self, flight_id: str) -> None:
+        flight = self.catalog.flights[flight_id]
+        departure = int(flight["Scheduled Time"])
+        route = (flight["From Destination"], flight["To Destination"])
+        self.by_time.remove(departure, flight_id)
+        for index, key in [(self.by_route, route), (self.by_origin, flight["From Destination"])]:
+            time_index = index.get(key)
+            if time_index is not None:
+                time_index.remove(departure, flight_id)
+                if not len(time_index):
+                    del index[key]
+
+
+def _matches(flight: Dict, min_price: Optional[int], max_price: Optional[int], seats: int,
+             statuses: Optional[set]) -> bool:
+    if statuses is not None and flight["Status"] not in statuses:
+        return False
+    if min_price is not None and flight["Price"] < min_price:
+        return False
+    if max_price is not None and flight["Price"] > max_price:
+        return False
+    return flight["Max Seats"] - flight["Occupied Seats"] >= seats
+
+
+def _remaining(max_price: Optional[int], spent: int) -> Optional[int]:
+    return None if max_price is None else max_price - spent
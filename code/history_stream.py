@@ -0,0 +1,83 @@
+# Chunked reading of the booking history, and the analytics cube.
+# pd.read_excel parses a whole workbook into one DataFrame, so memory grows
+# with years of bookings. openpyxl's read_only mode parses rows lazily;
+# here they are grouped into fixed-size DataFrame chunks. The charts read
+# an AnalyticsCube built from the store's pre-aggregated rows.
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+
+CHUNK_SIZE = 20000
+
+
+def iter_workbook_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield the first sheet of an .xlsx file as DataFrames of chunk_size rows."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) for name in header]
+        chunk = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue  # trailing blank rows in hand-edited workbooks
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+
+class AnalyticsCube:
+    """Bookings and revenue by (month, destination, airline).
+
+    Loaded from the store's pre-aggregated rows; the chart series are read
+    off the cells.
+    """
+
+    def __init__(self):
+        self.cells: Dict[Tuple[str, str, str], List[int]] = {}
+
+    @property
+    def rows(self) -> int:
+        return sum(bookings for bookings, _ in self.cells.values())
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple]) -> "AnalyticsCube":
+        """From (month YYYY-MM, destination, airline, bookings, revenue) rows."""
+        cube = cls()
+        for month, destination, airline, bookings, revenue in rows:
+            cube._add_cell((month, destination, airline), bookings, revenue)
+        return cube
+
+    def monthly_series(self) -> pd.Series:
+        """Revenue per month start, with empty months filled in as 0."""
+        revenue = Counter()
+        for (month, _, _), (_, cell_revenue) in self.cells.items():
+            revenue[month] += cell_revenue
+        series = pd.Series(revenue, dtype=float)
+        if series.empty:
+            return series
+        series.index = pd.to_datetime(series.index, format="%Y-%m")
+        series = series.sort_index()
+        return series.reindex(pd.date_range(series.index[0], series.index[-1], freq="MS"), fill_value=0)
+
+    def destination_counts(self) -> List[Tuple[str, int]]:
+        """(destination, bookings), most booked first."""
+        counts = Counter()
+        for (_, destination, _), (bookings, _) in self.cells.items():
+            counts[destination] += bookings
+        return counts.most_common()
+
+    def _add_cell(self, key: Tuple[str, str, str], bookings: int, revenue: int) -> None:
+        cell = self.cells.setdefault(key, [0, 0])
+        cell[0] += bookings
+        cell[1] += revenue
@@ -0,0 +1,232 @@
+# Virtualized Treeview for the flight history tab.
+# Only a window of a few pages of bookings is ever in the Treeview. Pages
+# are fetched from the store as the user scrolls towards either end of
+# the window, and the page at the other end is evicted. The scrollbar is
+# sized from the total number of bookings, not the rows loaded.
+# Pages are fetched through submit (the app's background worker) so the
+# store is never queried on the Tk thread.
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Tuple
+
+PAGE_SIZE = 200
+# Pages kept in the Treeview at once
+WINDOW_PAGES = 3
+# Fetch the next page once the bottom of the view passes this fraction of
+# the window (and the previous one once the top is above 1 - PREFETCH_AT)
+PREFETCH_AT = 0.9
+
+
+class LazyHistoryTree:
+    def __init__(self, parent, columns: List[str],
+                 fetch_page: Callable[[int, int], List[Tuple]],
+                 total_rows: Optional[int] = None, page_size: int = PAGE_SIZE,
+                 key_at: Optional[Callable[[int], int]] = None,
+                 submit: Optional[Callable] = None):
+        self.page_size = page_size
+        self.load_pending = False
+        # submit(job, on_done, on_error) runs job() off the Tk thread and
+        # calls back on it; without one pages are fetched in place
+        self.submit = submit or _run_now
+
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", style="Custom.Treeview")
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor="center", width=120)
+
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.status_label = tk.Label(parent, font=('Arial', 10), bg="#ffffff", anchor="w")
+        self.status_label.pack(side="bottom", fill="x")
+
+        self.tree.pack(fill="both", expand=True)
+        self.reset(fetch_page, total_rows, key_at)
+
+    def reset(self, fetch_page: Callable[[int, int], List[Tuple]],
+              total_rows: Optional[int] = None,
+              key_at: Optional[Callable[[int], int]] = None) -> None:
+        """Show a different row source, e.g. search results, from the top.
+
+        key_at(position) gives the after key of the page starting at that
+        row; with it and total_rows, dragging the scrollbar jumps straight
+        to any page. Without them only pages already seen can be jumped to.
+        """
+        self.fetch_page = fetch_page
+        self.total_rows = total_rows
+        self.key_at = key_at
+        # After key of each page seen so far, by page number
+        self.page_keys: Dict[int, int] = {0: 0}
+        # Row iids of the pages in the Treeview, by page number
+        self.pages: Dict[int, List[str]] = {}
+        self.first_page = 0
+        # Number of the last page and of all rows, once a short page is seen
+        self.end_page: Optional[int] = None
+        self.end_rows: Optional[int] = None
+        # Token of the page fetch in flight, if any; a reset or a jump
+        # replaces it, and the superseded fetch's rows are dropped
+        self.loading: Optional[object] = None
+        self.tree.delete(*self.tree.get_children())
+        self._load_page(0)
+
+    def load_next_page(self) -> None:
+        self.load_pending = False
+        if self.pages and self.loading is None and self._has_page(self.last_page + 1):
+            self._load_page(self.last_page + 1)
+
+    def load_previous_page(self) -> None:
+        self.load_pending = False
+        if self.pages and self.loading is None and self.first_page > 0:
+            self._load_page(self.first_page - 1)
+
+    @property
+    def last_page(self) -> int:
+        return self.first_page + len(self.pages) - 1
+
+    @property
+    def window_offset(self) -> int:
+        # Every page before the window is full
+        return self.first_page * self.page_size
+
+    def estimated_total(self) -> int:
+        loaded = self.window_offset + len(self.tree.get_children())
+        if self.total_rows is not None:
+            return max(self.total_rows, loaded)
+        if self.end_rows is not None:
+            return self.end_rows
+        # Search results: one more page's worth while more may follow
+        return loaded + self.page_size
+
+    def _has_page(self, page: int) -> bool:
+        if self.end_page is not None and page > self.end_page:
+            return False
+        return page in self.page_keys or (self.key_at is not None and self.total_rows is not None
+                                          and page * self.page_size < self.total_rows)
+
+    def _load_page(self, page: int, then: Optional[Callable[[], None]] = None) -> None:
+        """Fetch a page in the background and show it, then call then()."""
+        fetch_page, key_at, page_size = self.fetch_page, self.key_at, self.page_size
+        after = self.page_keys.get(page)
+
+        def job():
+            key = after if after is not None else key_at(page * page_size)
+            return key, fetch_page(key, page_size)
+
+        def done(result):
+            if self.loading is not request or not self.tree.winfo_exists():
+                return
+            self.loading = None
+            self.page_keys[page], rows = result
+            self._show_page(page, rows)
+            if then is not None:
+                then()
+
+        def failed(e):
+            if self.loading is request and self.tree.winfo_exists():
+                self.loading = None
+                self.status_label.config(text=f"Failed to load bookings: {e}")
+
+        request = self.loading = object()
+        self.submit(job, done, failed)
+
+    def _show_page(self, page: int, rows: List[Tuple]) -> None:
+        if len(rows) < self.page_size:
+            self.end_page = page
+            self.end_rows = page * self.page_size + len(rows)
+        else:
+            self.page_keys[page + 1] = rows[-1][0]
+
+        children = self.tree.get_children()
+        top_row = round(float(self.tree.yview()[0]) * len(children))
+        if self.pages and page == self.last_page + 1:
+            index, shift = "end", 0
+        elif self.pages and page == self.first_page - 1:
+            index, shift = 0, len(rows)
+            self.first_page = page
+        else:
+            # A jump: start a new window at this page
+            self.tree.delete(*children)
+            self.pages = {}
+            self.first_page = page
+            index, shift, top_row = "end", 0, 0
+
+        iids = []
+        for key, *values in rows:
+            iid = str(key)
+            iids.append(iid)
+            self.tree.insert("", index, iid=iid, values=values)
+            if index != "end":
+                index += 1
+        self.pages[page] = iids
+        self.pages = dict(sorted(self.pages.items()))
+
+        # Evict the page at the far end of the window from the new one
+        while len(self.pages) > WINDOW_PAGES:
+            if page == self.first_page:
+                self.tree.delete(*self.pages.pop(self.last_page))
+            else:
+                evicted = self.pages.pop(self.first_page)
+                self.tree.delete(*evicted)
+                self.first_page += 1
+                shift -= len(evicted)
+
+        # Keep the same rows in view after inserting or evicting above them
+        rows_loaded = len(self.tree.get_children())
+        if shift and rows_loaded:
+            self.tree.yview_moveto((top_row + shift) / rows_loaded)
+        self._update_status()
+
+    def _on_scrollbar(self, *args) -> None:
+        if args[0] != "moveto":
+            self.tree.yview(*args)
+            return
+        # Scrollbar fractions cover every booking; the Treeview's the window
+        total = self.estimated_total()
+        target = min(max(float(args[1]), 0.0), 1.0) * total
+        rows_loaded = len(self.tree.get_children())
+        page = int(min(target, total - 1) // self.page_size) if total else 0
+        if self.first_page <= page <= self.last_page or not self._has_page(page):
+            position = min(max(target - self.window_offset, 0), rows_loaded)
+            self.tree.yview_moveto(position / rows_loaded if rows_loaded else 0)
+            return
+        self._load_page(page, lambda: self.tree.yview_moveto(
+            (target - self.window_offset) / max(len(self.tree.get_children()), 1)))
+
+    def _on_tree_scroll(self, first, last) -> None:
+        first, last = float(first), float(last)
+        rows_loaded = len(self.tree.get_children())
+        total = self.estimated_total()
+        if total:
+            offset = self.window_offset
+            self.scrollbar.set((offset + first * rows_loaded) / total, (offset + last * rows_loaded) / total)
+        if self.load_pending or self.loading is not None or not self.pages:
+            return
+        # Defer so the Treeview finishes its own scroll first
+        if last >= PREFETCH_AT and self._has_page(self.last_page + 1):
+            self.load_pending = True
+            self.tree.after_idle(self.load_next_page)
+        elif first <= 1 - PREFETCH_AT and self.first_page > 0:
+            self.load_pending = True
+            self.tree.after_idle(self.load_previous_page)
+
+    def _update_status(self) -> None:
+        rows_loaded = len(self.tree.get_children())
+        first, last = self.window_offset + 1, self.window_offset + rows_loaded
+        if not rows_loaded:
+            self.status_label.config(text="No bookings")
+        elif self.total_rows is not None:
+            self.status_label.config(text=f"Showing {first}-{last} of {self.estimated_total()} bookings")
+        elif self.end_rows is not None:
+            self.status_label.config(text=f"Showing {first}-{last} of {self.end_rows} matching bookings")
+        else:
+            self.status_label.config(text=f"Showing {first}-{last} matching bookings (scroll for more)")
+
+
+def _run_now(job: Callable, on_done: Callable, on_error: Callable) -> None:
+    try:
+        result = job()
+    except Exception as e:
+        on_error(e)
+    else:
+        on_done(result)
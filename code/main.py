@@ -1,45 +1,86 @@
 # Load Necessary Modules.
+# Only cheap modules are imported here so the login window shows at once.
+# pandas (through the store) is first imported by the background job that
+# opens the store; matplotlib and seaborn only when charts are rendered.
 import tkinter as tk
 from tkinter import ttk, messagebox
-import os
-import sys
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
-from datetime import datetime
-import random
-import string
+import base64
+import threading
+from background import BackgroundWorker
+from flight_catalog import FlightCatalog
+from history_view import LazyHistoryTree
+from revenue_chart import RevenueChart
+from tracing import enable_profiling, enable_tracing, span, traced
 
 # Load Necessary Flight detail and Flight History File.
 # It will create history file, if not found one.
 FlightInformationFile = "flights.xlsx"
 FlightHistoryFile = "flight_history.xlsx"
+# Bookings are stored in SQLite; the workbooks are imported on first run
+# and exported again on logout.
+FlightDatabaseFile = "flights.db"
+
+store = None
+service = None
+store_lock = threading.Lock()
+# Runs Excel I/O, store reads/writes and chart rendering off the Tk thread
+worker = None
+catalog = FlightCatalog()
+
+# Open the booking store once per process
+def get_store():
+    global store
+    with store_lock:
+        if store is None:
+            from booking_store import open_store
+            store = open_store(FlightDatabaseFile, FlightInformationFile, FlightHistoryFile)
+    return store
+
+# Booking rules shared with scripts and the HTTP server (booking_server.py)
+def get_service():
+    global service
+    store = get_store()
+    with store_lock:
+        if service is None:
+            from booking_service import BookingService
+            service = BookingService(store)
+    return service
+
+# A BookingService method for worker.submit. The service is looked up on
+# the worker, since opening the store can block while it imports
+def service_call(name):
+    return lambda *args: getattr(get_service(), name)(*args)
+
+# Write the current store contents back to the workbooks, then call then()
+def export_workbooks(then):
+    def export():
+        get_store().export_excel(FlightInformationFile, FlightHistoryFile)
+
+    def failed(e):
+        print(f"Failed to export workbooks: {e}")
+        then()
+
+    worker.submit("export", export, on_done=lambda _: then(), on_error=failed,
+                  message="Saving workbooks...", cancel_stale=False)
+
+# Show errors from background jobs on the Tk thread
+def show_error(text):
+    return lambda e: messagebox.showerror("Error", f"{text}: {e}")
 
 # Read flight data Function
+@traced()
 def read_flights():
-    try:
-        df = pd.read_excel(FlightInformationFile)
-        return df
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to read flight data: {e}")
-        return pd.DataFrame()
-
-
-# Read flight History data Function
-def read_flight_history():
-    try:
-        df_history = pd.read_excel(FlightHistoryFile)
-        return df_history
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to read flight history data: {e}")
-        return pd.DataFrame()
+    return get_store().read_flights()
+
+
+# Read a page of the flight history (see BookingStore.read_history_page)
+@traced()
+def read_flight_history(after, limit):
+    return get_store().read_history_page(after, limit)
 
 # Display Flight Data
+@traced()
 def display_flights():
-    global df
-    df = read_flights()
-
     global flight_frame
 
     if 'flight_frame' in globals():
@@ -61,23 +102,32 @@ def display_flights():
 
     tree.pack(fill="both", expand=True)
 
-    for _, row in df.iterrows():
-        scheduled_time = pd.to_datetime(row["Scheduled Time"], unit='s')
-        formatted_scheduled_time = scheduled_time.strftime('%Y-%m-%d %H:%M:%S')
-        
-        flight_info = (
-            row["Airline Name"], row["Flight ID"], row["From Destination"],
-            row["To Destination"], formatted_scheduled_time,
-            row["Status"], row["Max Seats"], row["Occupied Seats"], row["Price"]
-        )
-        
-        tree.insert("", "end", values=flight_info)
+    # Read, index and format in the background; only the inserts run here
+    # The service's catalog also backs the flight search popup
+    def load():
+        from table_format import format_flight_rows
+        flights = read_flights()
+        with span("index_flights", flights=len(flights)):
+            flight_catalog = get_service().refresh(flights)
+        with span("format_flight_rows"):
+            rows = format_flight_rows(flights)
+        return flights, flight_catalog, rows
+
+    def show(result):
+        global df, catalog
+        df, catalog, rows = result
+        if not tree.winfo_exists():
+            return
+        with span("insert_flight_rows", rows=len(rows)):
+            for flight_info in rows:
+                tree.insert("", "end", values=flight_info)
+
+    worker.submit("flights", load, on_done=show, on_error=show_error("Failed to read flight data"),
+                  message="Loading flights...")
 
 # Display flight History
+@traced()
 def display_flight_history():
-    global df_history
-    df_history = read_flight_history()
-
     global history_frame
 
     if 'history_frame' in globals():
@@ -92,49 +142,37 @@ def display_flight_history():
         "User Name", "User Address", "User Phone", "User ID"
     ]
     
-    tree = ttk.Treeview(history_frame, columns=columns, show="headings", style="Custom.Treeview")
-    
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, anchor="center", width=120)
-
-    # Adding vertical scrollbar
-    scrollbar = ttk.Scrollbar(history_frame, orient="vertical", command=tree.yview)
-    tree.configure(yscroll=scrollbar.set)
-    scrollbar.pack(side="right", fill="y")
-
-    tree.pack(fill="both", expand=True)
-
-    if 'Booking Date' not in df_history.columns:
-        tk.Label(history_frame, text="No 'Booking Date' column found in flight history data.", font=('Arial', 12, 'bold'), bg="#ffffff").pack(pady=10)
-        return
-
-    max_rows = 200  # Maximum number of rows to display
-    row_count = 0
-    
-    for _, row in df_history.iterrows():
-        if row_count >= max_rows:
-            break
-        booking_date = pd.to_datetime(row["Booking Date"])
-        formatted_booking_date = booking_date.strftime('%Y-%m-%d %H:%M:%S')
-
-        scheduled_time = pd.to_datetime(row["Scheduled Time"])
-        formatted_scheduled_time = scheduled_time.strftime('%Y-%m-%d %H:%M:%S')
-
-        history_info = (
-            formatted_booking_date, row["Airline Name"], row["Flight ID"], row["From Destination"],
-            row["To Destination"], formatted_scheduled_time, row["Price"], row["Seat"],
-            row["User Name"], row["User Address"], row["User Phone"], row["User ID"]
+    # Count and aggregates in the background; the tab is filled in show()
+    def load():
+        store = get_store()
+        return store, store.count_bookings(), store.read_statistics()
+
+    def show(result, frame=history_frame):
+        store, total_rows, statistics = result
+        if not frame.winfo_exists():
+            return
+        # Rows are fetched from the store a page at a time as the user scrolls
+        history_tree = LazyHistoryTree(
+            frame, columns,
+            fetch_page=read_flight_history,
+            total_rows=total_rows,
+            key_at=store.history_key_at,
+            submit=submit_history_page
         )
+        display_statistics_and_search(frame, history_tree, statistics)
 
-        tree.insert("", "end", values=history_info)
-        row_count += 1
+    worker.submit("history", load, on_done=show, on_error=show_error("Failed to read booking history"),
+                  message="Loading booking history...")
 
-    display_statistics_and_search(history_frame, tree)
+# Fetch a page of the history table on the worker; a newer fetch (a jump
+# or a new search) cancels one still waiting
+def submit_history_page(job, on_done, on_error):
+    worker.submit("history_page", job, on_done=on_done, on_error=on_error, message="Loading bookings...")
 
 
 # Function for Statistics view in admin 
-def display_statistics_and_search(parent_frame, tree):
+@traced()
+def display_statistics_and_search(parent_frame, history_tree, statistics):
     stats_search_frame = tk.Frame(parent_frame, bg="#ffffff")
     stats_search_frame.pack(side=tk.LEFT, fill="both", expand=True, padx=20, pady=20)
 
@@ -145,18 +183,16 @@ def display_statistics_and_search(parent_frame, tree):
     search_entry = tk.Entry(search_frame, font=('Arial', 12))
     search_entry.pack(side=tk.LEFT, padx=10)
 
-    # Search user in UI based on phone number, UserId, User Name
+    # Search the whole history by phone number, UserId, User Name.
+    # Matches are fetched from the store's search index a page at a time.
     def search_user():
-        search_term = search_entry.get().strip().lower()
-        for child in tree.get_children():
-            values = tree.item(child, "values")
-            if (search_term in values[8].lower()) or (search_term in values[10].lower()) or (search_term in values[11].lower()):
-                tree.selection_set(child)
-                tree.see(child)
-                tree.item(child, tags=("highlight",))
-            else:
-                tree.detach(child)
-        tree.tag_configure("highlight", background="yellow")
+        search_term = search_entry.get().strip()
+        if not search_term:
+            reset_tree()
+            return
+        history_tree.reset(
+            lambda after, limit: get_store().search_bookings(search_term, after, limit)
+        )
 
     def reset_tree():
         search_entry.delete(0, tk.END)
@@ -171,98 +207,147 @@ def display_statistics_and_search(parent_frame, tree):
     stats_frame = tk.Frame(stats_search_frame, bg="#ffffff")
     stats_frame.pack(fill="both", expand=True, padx=10, pady=20)
 
-    df_history['Booking Date'] = pd.to_datetime(df_history['Booking Date'])
-    daily_revenue = df_history.groupby(df_history['Booking Date'].dt.date)['Price'].sum()
-
-    total_bookings = len(df_history)
-    total_revenue = df_history["Price"].sum()
+    # Aggregates are kept up to date by the store on every booking
+    total_bookings = statistics["total_bookings"]
+    total_revenue = statistics["total_revenue"]
 
     # Display total bookings and total revenue
     tk.Label(stats_frame, text=f"Total Bookings: {total_bookings}", font=('Arial', 12, 'bold'), bg="#ffffff").pack(anchor='nw')
     tk.Label(stats_frame, text=f"Total Revenue: रु {total_revenue}", font=('Arial', 12, 'bold'), bg="#ffffff").pack(anchor='nw')
 
+    if statistics["route_revenue"]:
+        from_destination, to_destination, _, route_revenue = statistics["route_revenue"][0]
+        tk.Label(stats_frame, text=f"Top Route: {from_destination} - {to_destination} (रु {route_revenue})", font=('Arial', 10), bg="#ffffff").pack(anchor='nw')
+    if statistics["airline_revenue"]:
+        airline_name, _, airline_revenue = statistics["airline_revenue"][0]
+        tk.Label(stats_frame, text=f"Top Airline: {airline_name} (रु {airline_revenue})", font=('Arial', 10), bg="#ffffff").pack(anchor='nw')
+
     graph_frame = tk.Frame(parent_frame, bg="#ffffff")
     graph_frame.pack(side=tk.RIGHT, fill="both", expand=True, padx=20, pady=20)
 
-    canvas = tk.Canvas(graph_frame, bg="white", height=400, width=800)
-    canvas.pack(padx=20, pady=20)
-
-    # Draw graph title
-    canvas.create_text(400, 30, text="Daily Revenue", font=('Arial', 14, 'bold'))
-
-    # Draw axes
-    canvas.create_line(50, 350, 750, 350, fill="black")  # X-axis
-    canvas.create_line(50, 350, 50, 50, fill="black")    # Y-axis
-
-    max_revenue = max(daily_revenue)
-    scale_factor = 300 / max_revenue  # Scale the graph to fit within the canvas
-
-    # Draw X-axis labels and grid lines
-    for i, (date, revenue) in enumerate(daily_revenue.items()):
-        x = 50 + (i * (700 / (len(daily_revenue) - 1)))
-        if i % 5 == 0:  # Show date label every 5 days
-            canvas.create_text(x, 360, text=date.strftime('%b %d'), font=('Arial', 10))
-        canvas.create_line(x, 50, x, 350, fill="lightgray")
-
-    # Draw Y-axis labels and grid lines
-    for i in range(0, int(max_revenue) + 500, 500):
-        y = 350 - (i * scale_factor)
-        canvas.create_text(30, y, text=f"रु{i}", font=('Arial', 10))
-        canvas.create_line(50, y, 750, y, fill="lightgray")
-
-    # Draw graph
-    prev_x, prev_y = 50, 350 - daily_revenue.iloc[0] * scale_factor
-    for i, (date, revenue) in enumerate(daily_revenue.items()):
-        x = 50 + (i * (700 / (len(daily_revenue) - 1)))
-        y = 350 - (revenue * scale_factor)
-        canvas.create_line(prev_x, prev_y, x, y, fill="blue")
-        canvas.create_oval(x-3, y-3, x+3, y+3, fill="blue", outline="blue")
-        canvas.create_text(x, y-10, text=f"रु{revenue:.2f}", font=('Arial', 8), fill="black")
-        prev_x, prev_y = x, y
-
-    # Label the graph
-    canvas.create_text(400, 370, text="Days", font=('Arial', 12))
-    canvas.create_text(20, 200, text="Revenue", font=('Arial', 12), angle=90)
-
-# Display graph based info 
-def display_visualizations_popup():
-    global df_history
-    df_history = read_flight_history()
-
-    if df_history.empty:
-        messagebox.showerror("Error", "No flight history data available for visualization.")
-        return
-
-    if 'Booking Date' not in df_history.columns:
-        messagebox.showerror("Error", "No 'Booking Date' column found in flight history data.")
-        return
-
+    RevenueChart(graph_frame, statistics["daily_revenue"])
+
+# Render the analytics charts to PNG bytes. Runs on the worker thread, so it
+# uses a plain matplotlib Figure rather than pyplot.
+# Last rendered charts as (analytics version, PNG bytes)
+figure_cache = (None, None)
+
+@traced()
+def render_visualizations():
+    global figure_cache
+    from analytics_chart import render_analytics_png
+    from history_stream import AnalyticsCube
+
+    store = get_store()
+    # Read the version first: a booking saved meanwhile bumps it, so the
+    # next click renders again
+    version = store.analytics_version()
+    if version is not None and figure_cache[0] == version:
+        return figure_cache[1]
+
+    # The store keeps the month x destination x airline cube up to date as
+    # bookings are written, so no booking rows are read here
+    with span("read_analytics_cube"):
+        cube = AnalyticsCube.from_rows(store.read_analytics_cube())
+
+    figure_cache = (version, render_analytics_png(cube))
+    return figure_cache[1]
+
+# Search bookable flights by route, dates, price and free seats; double
+# clicking a result fills in the Flight ID to book
+@traced()
+def display_flight_search_popup(flight_id_entry):
     popup = tk.Toplevel(root)
-    popup.title("Visualizations")
-    popup.geometry("1200x600")
+    popup.title("Search Flights")
+    popup.geometry("900x500")
     popup.config(bg="#e0e0e0")
 
-    df_history['Booking Date'] = pd.to_datetime(df_history['Booking Date'])
-    df_history.set_index('Booking Date', inplace=True)
-    monthly_revenue = df_history['Price'].resample('MS').sum()
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 7))
+    form = tk.Frame(popup, bg="#e0e0e0")
+    form.pack(fill="x", padx=10, pady=10)
+
+    places = sorted({flight["From Destination"] for flight in catalog.flights.values()}
+                    | {flight["To Destination"] for flight in catalog.flights.values()})
+    fields = {}
+    for idx, (name, widget) in enumerate([
+        ("From", ttk.Combobox(form, values=places, width=15)),
+        ("To", ttk.Combobox(form, values=places, width=15)),
+        ("Date From (YYYY-MM-DD)", tk.Entry(form, width=12)),
+        ("Date To (YYYY-MM-DD)", tk.Entry(form, width=12)),
+        ("Max Price", tk.Entry(form, width=10)),
+        ("Seats", tk.Entry(form, width=5)),
+    ]):
+        tk.Label(form, text=f"{name}:", bg="#e0e0e0", font=('Arial', 10)).grid(row=idx // 3, column=idx % 3 * 2, padx=5, pady=5, sticky="w")
+        widget.grid(row=idx // 3, column=idx % 3 * 2 + 1, padx=5, pady=5, sticky="w")
+        fields[name] = widget
+    fields["Seats"].insert(0, "1")
+    connections = tk.BooleanVar(value=True)
+    tk.Checkbutton(form, text="Include connections", variable=connections, bg="#e0e0e0").grid(row=2, column=0, columnspan=2, sticky="w")
+
+    columns = ["Flight ID", "Route", "Scheduled Time", "Price", "Free Seats"]
+    results = ttk.Treeview(popup, columns=columns, show="headings")
+    for col in columns:
+        results.heading(col, text=col)
+        results.column(col, anchor="center", width=150)
+    results.pack(fill="both", expand=True, padx=10, pady=10)
 
-    monthly_revenue.plot(kind='line', color='b', ax=ax1)
-    ax1.set_title('Monthly Booking Trend')
-    ax1.set_ylabel('Total Revenue')
-    ax1.set_xlabel('Month')
+    def show(itineraries):
+        if not results.winfo_exists():
+            return
+        results.delete(*results.get_children())
+        import pandas as pd
+        for legs in itineraries:
+            results.insert("", "end", values=(
+                " + ".join(flight["Flight ID"] for flight in legs),
+                " → ".join([legs[0]["From Destination"]] + [flight["To Destination"] for flight in legs]),
+                pd.to_datetime(legs[0]["Scheduled Time"], unit='s').strftime('%Y-%m-%d %H:%M:%S'),
+                sum(flight["Price"] for flight in legs),
+                min(flight["Max Seats"] - flight["Occupied Seats"] for flight in legs),
+            ))
+        if not itineraries:
+            messagebox.showinfo("Search Flights", "No flights match your search.", parent=popup)
+
+    def search():
+        try:
+            max_price = int(fields["Max Price"].get()) if fields["Max Price"].get().strip() else None
+            seats = int(fields["Seats"].get() or 1)
+        except ValueError:
+            messagebox.showerror("Error", "Max Price and Seats must be whole numbers.", parent=popup)
+            return
+        worker.submit("flight_search", service_call("find_flights"),
+                      fields["From"].get().strip() or None, fields["To"].get().strip() or None,
+                      fields["Date From (YYYY-MM-DD)"].get().strip() or None,
+                      fields["Date To (YYYY-MM-DD)"].get().strip() or None,
+                      None, max_price, seats, 3 if connections.get() else 1,
+                      on_done=show, on_error=show_error("Search failed"), message="Searching flights...")
+
+    # Connections are booked one leg at a time, starting with the first
+    def choose(_):
+        selected = results.focus()
+        if selected:
+            flight_id_entry.delete(0, tk.END)
+            flight_id_entry.insert(0, results.item(selected, "values")[0].split(" + ")[0])
+            popup.destroy()
+
+    results.bind("<Double-1>", choose)
+    tk.Button(form, text="Search", command=search, bg="#0d6efd", fg="white", font=('Arial', 10, 'bold')).grid(row=2, column=5, padx=5, pady=5, sticky="e")
 
-    sns.countplot(y='To Destination', data=df_history, order=df_history['To Destination'].value_counts().index, ax=ax2)
-    ax2.set_title('Number of Flights by Destination')
-    ax2.set_ylabel('Destination')
-    ax2.set_xlabel('Number of Flights')
+# Display graph based info 
+@traced()
+def display_visualizations_popup():
+    def show(png):
+        popup = tk.Toplevel(root)
+        popup.title("Visualizations")
+        popup.geometry("1200x600")
+        popup.config(bg="#e0e0e0")
 
-    fig.tight_layout()
+        image = tk.PhotoImage(master=popup, data=base64.b64encode(png))
+        chart_label = tk.Label(popup, image=image, bg="#e0e0e0")
+        chart_label.image = image  # keep a reference so Tk does not drop it
+        chart_label.pack(fill='both', expand=True)
 
-    canvas = FigureCanvasTkAgg(fig, master=popup)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
+    worker.submit("visualizations", render_visualizations, on_done=show,
+                  on_error=show_error("Failed to build visualizations"),
+                  message="Rendering charts...")
 
 # Edit flight function for User Role
 def edit_flight(whichUser):
@@ -286,13 +371,12 @@ def edit_flight(whichUser):
             tk.messagebox.showerror("Permission Denied", "You must be an admin to edit flight data.")
             return
 
-        flight_data = df[df["Flight ID"] == flight_id]
+        flight_row = catalog.get(flight_id)
 
-        if not flight_data.empty:
+        if flight_row is not None:
             edit_frame = tk.Frame(root, bg="#fff3cd")
             edit_frame.pack(fill="both", expand=True)
             
-            flight_row = flight_data.iloc[0]
             fields = ["Airline Name", "From Destination", "To Destination", 
                       "Scheduled Time", "Status", "Max Seats", "Occupied Seats", "Price"]
             
@@ -304,6 +388,7 @@ def edit_flight(whichUser):
                 entry = tk.Entry(edit_frame, width=30, font=('Arial', 10))
                 
                 if field == "Scheduled Time":
+                    import pandas as pd
                     scheduled_time = pd.to_datetime(flight_row[field], unit='s')
                     formatted_scheduled_time = scheduled_time.strftime('%Y-%m-%d %H:%M:%S')
                     entry.insert(0, formatted_scheduled_time)
@@ -313,35 +398,23 @@ def edit_flight(whichUser):
                 entries[field] = entry
 
             def save_info():
-                for field, entry in entries.items():
-                    new_value = entry.get().strip()
-                    try:
-                        if field == "Scheduled Time":
-                            try:
-                                parsed_time = pd.to_datetime(new_value, format='%Y-%m-%d %H:%M:%S')
-                                new_value = int(parsed_time.timestamp())
-                            except ValueError:
-                                raise ValueError(f"Invalid date format for {field}. Expected format: YYYY-MM-DD HH:MM:SS")
-                        elif field in ["Max Seats", "Occupied Seats", "Price"]:
-                            new_value = int(new_value)
-                        df.loc[df["Flight ID"] == flight_id, field] = new_value
-                    except ValueError as ve:
-                        print(f"Error updating field {field}: {ve}")
-                        tk.messagebox.showerror("Error", f"Invalid input for {field}: {ve}")
-                        return
-                    except Exception as e:
-                        print(f"Error updating field {field}: {e}")
-                        tk.messagebox.showerror("Error", f"Unexpected error: {e}")
-                        return
-                
+                changes = {field: entry.get() for field, entry in entries.items()}
+                from booking_service import parse_flight_changes
                 try:
-                    df.to_excel(FlightInformationFile, index=False)
-                except Exception as e:
-                    tk.messagebox.showerror("Error", f"Failed to save data: {e}")
+                    parse_flight_changes(changes)
+                except ValueError as ve:
+                    print(f"Error updating flight {flight_id}: {ve}")
+                    tk.messagebox.showerror("Error", str(ve))
                     return
+                
+                # The service also applies the edit to the shared catalog
+                def saved(parsed):
+                    edit_frame.destroy()
+                    display_flights()
 
-                edit_frame.destroy()
-                display_flights()
+                worker.submit("edit", service_call("edit"), flight_id, changes,
+                              on_done=saved, on_error=show_error("Failed to save data"),
+                              message="Saving flight...", cancel_stale=False)
 
             save_button = tk.Button(edit_frame, text="Save Info", command=save_info, bg="#0d6efd", fg="white", font=('Arial', 10))
             save_button.grid(row=len(fields), column=1, pady=10)
@@ -368,16 +441,20 @@ def book_flight(whichUser):
     flight_id_entry = tk.Entry(button_frame, font=('Arial', 10))
     flight_id_entry.pack(side=tk.LEFT, padx=10)
 
+    search_button = tk.Button(button_frame, text="Search Flights", command=lambda: display_flight_search_popup(flight_id_entry),
+                              bg="#0d6efd", fg="white", font=('Arial', 10))
+    search_button.pack(side=tk.LEFT, padx=10)
+
     def book_button_click():
         flight_id = flight_id_entry.get().strip()
 
-        flight_data = df[df["Flight ID"] == flight_id]
+        flight_row = catalog.get(flight_id)
 
-        if flight_data.empty:
+        if flight_row is None:
             messagebox.showerror("Error", "Flight ID not found")
             return
 
-        flight_status = flight_data.iloc[0]["Status"]
+        flight_status = flight_row["Status"]
 
         if flight_status not in ["Ongoing", "Rescheduled"]:
             messagebox.showerror("Error", "This flight has been cancelled.")
@@ -398,7 +475,7 @@ def book_flight(whichUser):
                             borderwidth=1, relief="solid", width=15, anchor="w", bg="#f2f2f2")
             label.grid(row=0, column=col, padx=3, pady=3, sticky="nsew")
 
-        flight_row = flight_data.iloc[0]
+        import pandas as pd
         scheduled_time = pd.to_datetime(flight_row["Scheduled Time"], unit='s')
         formatted_scheduled_time = scheduled_time.strftime('%Y-%m-%d %H:%M:%S')
 
@@ -439,19 +516,32 @@ def book_flight(whichUser):
         user_id_entry = tk.Entry(user_info_frame, font=('Arial', 10))
         user_id_entry.grid(row=3, column=1, padx=10, pady=5)
 
+        seat_preference_label = tk.Label(user_info_frame, text="Seat Preference:", bg="white", font=('Arial', 10))
+        seat_preference_label.grid(row=0, column=2, padx=10, pady=5, sticky="w")
+        seat_preference = tk.StringVar(value="Any")
+        seat_preference_menu = ttk.Combobox(user_info_frame, textvariable=seat_preference, state="readonly",
+                                            values=["Any", "Window", "Middle", "Aisle"], font=('Arial', 10), width=10)
+        seat_preference_menu.grid(row=0, column=3, padx=10, pady=5)
+
         def continue_booking():
             user_name = user_name_entry.get().strip()
             user_address = user_address_entry.get().strip()
             user_phone = user_phone_entry.get().strip()
             user_id = user_id_entry.get().strip()
             
-            user_info = (user_name, user_address, user_phone, user_id)
+            # The service validates the request and builds the booking record
+            def rejected(e):
+                from booking_service import BookingError
+                messagebox.showerror("Error", str(e) if isinstance(e, BookingError) else f"Failed to read flight: {e}")
 
-            if not user_name or not user_address or not user_phone or not user_id:
-                messagebox.showerror("Error", "Please fill out all fields.")
-                return
-            
-            generate_booking_pass(flight_info, user_info, whichUser, flight_info_frame, user_info_frame)
+            def booking_ready(booking):
+                preference = seat_preference.get().lower()
+                generate_booking_pass(booking, whichUser, flight_info_frame, user_info_frame,
+                                      None if preference == "any" else preference)
+
+            worker.submit("new_booking", service_call("new_booking"),
+                          flight_info[1], user_name, user_address, user_phone, user_id,
+                          on_done=booking_ready, on_error=rejected, message="Checking flight...")
 
         def cancel_booking():
             flight_info_frame.destroy()
@@ -467,29 +557,18 @@ def book_flight(whichUser):
     book_button = tk.Button(button_frame, text="Book Flight", command=book_button_click, bg="#0d6efd", fg="white", font=('Arial', 10))
     book_button.pack(side=tk.LEFT, padx=10)
 
-# Also update and increase the seat by one.
-def update_occupied_seat(flight_info, df, flight_history_file=FlightInformationFile):
-    flight_id = flight_info[1]
-    max_seats = flight_info[6]
-    occupied_seats = flight_info[7]
-    
-    if occupied_seats < max_seats:
-        new_occupied_seats = occupied_seats + 1
-        df.loc[df["Flight ID"] == flight_id, "Occupied Seats"] = new_occupied_seats
-        
-        df.to_excel(flight_history_file, index=False)
-
-        display_flights()
-    else:
-        messagebox.showwarning("No Available Seats", "No seats available on this flight.")
+# Save the booking and increase the seat count by one. The store checks
+# the count and commits the seat update together with the history insert.
+@traced()
+def update_occupied_seat(booking, seat_preference=None):
+    return get_service().confirm(booking, seat_preference)
 
 # Generate Booking Pass and save it to history file.
-def generate_booking_pass(flight_info, user_info, whichUser, flight_info_frame, user_info_frame):
+def generate_booking_pass(booking, whichUser, flight_info_frame, user_info_frame, seat_preference=None):
     def reset_to_booking_ui():
         flight_info_frame.destroy()
         user_info_frame.destroy()
         booking_pass_window.destroy()
-        update_occupied_seat(flight_info, df)
         book_flight(whichUser)
 
     booking_pass_window = tk.Toplevel(root)
@@ -503,25 +582,21 @@ def generate_booking_pass(flight_info, user_info, whichUser, flight_info_frame,
     details_frame = tk.Frame(booking_pass_window, bg="white", relief="solid", borderwidth=2)
     details_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
-    random_seat = f"{random.choice(string.ascii_uppercase[:6])}{random.randint(1, 30)}"
-
     left_frame = tk.Frame(details_frame, bg="white")
     left_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nw")
 
     flight_label = tk.Label(left_frame, text="Flight Information", font=('Arial', 12, 'bold'), bg="white")
     flight_label.pack(anchor="w", pady=5)
 
-    booking_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
     for label_text, value in [
-        ("Date", booking_date),
-        ("Airline Name", flight_info[0]),
-        ("Flight ID", flight_info[1]),
-        ("From Destination", flight_info[2]),
-        ("To Destination", flight_info[3]),
-        ("Scheduled Time", flight_info[4]),
-        ("Price", flight_info[8]),
-        ("Seat", random_seat)
+        ("Date", booking["Booking Date"]),
+        ("Airline Name", booking["Airline Name"]),
+        ("Flight ID", booking["Flight ID"]),
+        ("From Destination", booking["From Destination"]),
+        ("To Destination", booking["To Destination"]),
+        ("Scheduled Time", booking["Scheduled Time"]),
+        ("Price", booking["Price"]),
+        ("Seat", booking["Seat"] or "Assigned when saved")
     ]:
         tk.Label(left_frame, text=f"{label_text}: {value}", font=('Arial', 10), bg="white", anchor="w").pack(anchor="w", padx=10)
 
@@ -532,45 +607,32 @@ def generate_booking_pass(flight_info, user_info, whichUser, flight_info_frame,
     user_label.pack(anchor="w", pady=5)
 
     for label_text, value in [
-        ("Name", user_info[0]),
-        ("Address", user_info[1]),
-        ("Phone Number", user_info[2]),
-        ("Valid ID Card", user_info[3])
+        ("Name", booking["User Name"]),
+        ("Address", booking["User Address"]),
+        ("Phone Number", booking["User Phone"]),
+        ("Valid ID Card", booking["User ID"])
     ]:
         tk.Label(right_frame, text=f"{label_text}: {value}", font=('Arial', 10), bg="white", anchor="w").pack(anchor="w", padx=10)
 
+    @traced("save_booking_pass")
     def save_booking_pass():
-        flight_history_file = FlightHistoryFile
+        def booked(saved):
+            display_flights()
+            messagebox.showinfo("Booking Success", f"Your booking has been confirmed! Your seat is {saved['Seat']}. "
+                                                   "A booking pass has been generated.")
+            reset_to_booking_ui()
+
+        def failed(e):
+            save_button.config(state=tk.NORMAL)
+            from booking_store import SeatUnavailableError
+            if isinstance(e, SeatUnavailableError):
+                messagebox.showwarning("No Available Seats", str(e))
+            else:
+                messagebox.showerror("Error", f"Failed to save booking: {e}")
 
-        try:
-            df_history = pd.read_excel(flight_history_file)
-        except FileNotFoundError:
-            df_history = pd.DataFrame(columns=["Booking Date", "Airline Name", "Flight ID", "From Destination",
-                                               "To Destination", "Scheduled Time", "Price", "Seat", 
-                                               "User Name", "User Address", "User Phone", "User ID"])
-
-        new_booking = {
-            "Booking Date": booking_date,
-            "Airline Name": flight_info[0],
-            "Flight ID": flight_info[1],
-            "From Destination": flight_info[2],
-            "To Destination": flight_info[3],
-            "Scheduled Time": flight_info[4],
-            "Price": flight_info[8],
-            "Seat": random_seat,
-            "User Name": user_info[0],
-            "User Address": user_info[1],
-            "User Phone": user_info[2],
-            "User ID": user_info[3]
-        }
-
-        df_history = df_history._append(new_booking, ignore_index=True)
-
-        df_history.to_excel(flight_history_file, index=False)
-
-        messagebox.showinfo("Booking Success", "Your booking has been confirmed! A booking pass has been generated.")
-
-        reset_to_booking_ui()
+        save_button.config(state=tk.DISABLED)
+        worker.submit("booking", update_occupied_seat, booking, seat_preference, on_done=booked, on_error=failed,
+                      message="Saving booking...", cancel_stale=False)
 
     button_frame = tk.Frame(booking_pass_window, bg="#e0e0e0")
     button_frame.pack(fill="x", pady=10)
@@ -584,9 +646,18 @@ def generate_booking_pass(flight_info, user_info, whichUser, flight_info_frame,
     cancel_button.pack(side="right", padx=50)
 
 def logout():
-    # Restart the script to simulate a logout
-    python = sys.executable
-    os.execl(python, python, *sys.argv)
+    # Reset the session in place rather than restarting the interpreter:
+    # the store, loaded modules and cached charts are kept
+    def reset_session():
+        worker.cancel_all()
+        for widget in root.winfo_children():
+            if widget is not worker.status_frame:
+                widget.destroy()
+        for name in ("flight_frame", "history_frame", "button_frame"):
+            globals().pop(name, None)
+        show_login_screen()
+
+    export_workbooks(then=reset_session)
 
 
 def admin_activity(whichUser):
@@ -656,11 +727,37 @@ def login(username_entry, password_entry, frame):
 
 # The important function to create login UI
 def create_login_ui():
-    global user_frame, admin_frame, root, tab_control
+    global root, worker
     root = tk.Tk()
     root.title("Flight Management System")
     root.config(bg="#e0e0e0")
-    
+    root.protocol("WM_DELETE_WINDOW", lambda: export_workbooks(then=root.destroy))
+
+    # Open the store (and import the workbooks on first run) while the
+    # login screen is shown
+    worker = BackgroundWorker(root)
+    # Workbooks edited outside the app are not imported over the database
+    def open_and_check():
+        return get_store().workbooks_changed(FlightInformationFile, FlightHistoryFile)
+
+    def report_changed_workbooks(changed):
+        if changed:
+            messagebox.showwarning(
+                "Workbooks Changed",
+                f"{FlightInformationFile} or {FlightHistoryFile} was edited outside the app. "
+                "The edits were not imported, so no saved booking is lost; "
+                "the workbooks will be overwritten on the next logout.")
+
+    worker.submit("open_store", open_and_check, on_done=report_changed_workbooks,
+                  on_error=show_error("Failed to open flight data"), message="Loading flight data...")
+
+    show_login_screen()
+    root.mainloop()
+
+# Login screen, shown at startup and again after logout
+def show_login_screen():
+    global user_frame, admin_frame, tab_control
+
     tab_control = ttk.Notebook(root)
     tab_control.pack(expand=1, fill="both")
     
@@ -701,11 +798,27 @@ def create_login_ui():
         bg="#0d6efd", fg="white", font=('Arial', 12, 'bold')
     )
     admin_login_button.grid(row=2, columnspan=2, pady=10)
-    
-    root.mainloop()
+
+
+# Command line switches for measuring the app in the field:
+#   python main.py --trace trace.json      timing spans, for chrome://tracing
+#   python main.py --profile main.prof     cProfile of every thread, for pstats
+def parse_args():
+    import argparse
+    parser = argparse.ArgumentParser(description="Flight booking system")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write timing spans to FILE as a Chrome trace (JSON) on exit")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="profile every thread with cProfile and save the stats to FILE on exit")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.trace:
+        enable_tracing(args.trace)
+    if args.profile:
+        enable_profiling(args.profile)
     create_login_ui()
 else:
     print("This function Does not have Return Value.")
\ No newline at end of file
@@ -0,0 +1,178 @@
+# Daily revenue line chart drawn on a tk.Canvas.
+# The number of canvas items depends on the canvas size, not on the number
+# of days: visible points are decimated to one min/max pair per pixel
+# column and drawn as a single polyline. Mouse wheel zooms, dragging pans.
+import itertools
+import math
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import List, Sequence, Tuple
+
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 70, 20, 50, 50
+# Draw point markers and value labels only when this few points are visible
+MAX_LABELLED_POINTS = 40
+
+
+def nice_ticks(low: float, high: float, max_ticks: int = 6) -> List[float]:
+    """Round tick values (1, 2, 5 x 10^n steps) covering [low, high]: the
+    first is <= low and the last >= high. At most max(max_ticks, 3) ticks."""
+    if high <= low:
+        high = low + 1
+    raw_step = (high - low) / max(max_ticks - 1, 1)
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    # Rounding the ends outwards can add a tick; widen the step if it must.
+    # A range around zero always needs three ticks.
+    for step in (m * magnitude * 10 ** k for k in itertools.count() for m in (1, 2, 5)):
+        first, last = math.floor(low / step), math.ceil(high / step)
+        if step >= raw_step and last - first + 1 <= max(max_ticks, 3):
+            return [i * step for i in range(first, last + 1)]
+
+
+def decimate(xs: Sequence[float], ys: Sequence[float], x_low: float, x_high: float,
+             width: int) -> List[Tuple[float, float]]:
+    """Reduce the points in [x_low, x_high] to at most two per pixel column.
+
+    Each column keeps its minimum and maximum (in x order), so peaks and
+    dips survive however many points fall into one pixel.
+    """
+    start = max(bisect_left(xs, x_low) - 1, 0)
+    end = min(bisect_right(xs, x_high) + 1, len(xs))
+    if end - start <= 2 * width:
+        return list(zip(xs[start:end], ys[start:end]))
+
+    span = (x_high - x_low) or 1
+    points = []
+    bucket = None
+    low = high = None
+    for i in range(start, end):
+        column = int((xs[i] - x_low) / span * width)
+        if column != bucket:
+            if bucket is not None:
+                points.extend(sorted({low, high}))
+            bucket = column
+            low = high = (xs[i], ys[i])
+        else:
+            if ys[i] < low[1]:
+                low = (xs[i], ys[i])
+            if ys[i] > high[1]:
+                high = (xs[i], ys[i])
+    points.extend(sorted({low, high}))
+    return points
+
+
+class RevenueChart:
+    def __init__(self, parent, daily_revenue: Sequence[Tuple[str, float]],
+                 width: int = 800, height: int = 400, title: str = "Daily Revenue"):
+        self.title = title
+        self.xs = [date.fromisoformat(day).toordinal() for day, _ in daily_revenue]
+        self.ys = [float(revenue) for _, revenue in daily_revenue]
+
+        self.canvas = tk.Canvas(parent, bg="white", height=height, width=width)
+        self.canvas.pack(padx=20, pady=20, fill="both", expand=True)
+
+        self.reset_view()
+        self.drag_start = None
+        self.canvas.bind("<Configure>", lambda e: self.draw())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self._zoom(e.x, 0.8))  # X11 scroll up
+        self.canvas.bind("<Button-5>", lambda e: self._zoom(e.x, 1.25))  # X11 scroll down
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<Double-Button-1>", lambda e: (self.reset_view(), self.draw()))
+        self.draw()
+
+    def reset_view(self) -> None:
+        if self.xs:
+            self.x_low, self.x_high = self.xs[0], self.xs[-1]
+        else:
+            today = date.today().toordinal()
+            self.x_low, self.x_high = today, today
+        if self.x_high == self.x_low:
+            # A single day still needs a non-empty axis
+            self.x_low -= 1
+            self.x_high += 1
+
+    def draw(self) -> None:
+        canvas = self.canvas
+        canvas.delete("all")
+        width = max(canvas.winfo_width(), int(canvas.cget("width")))
+        height = max(canvas.winfo_height(), int(canvas.cget("height")))
+        left, right = MARGIN_LEFT, width - MARGIN_RIGHT
+        top, bottom = MARGIN_TOP, height - MARGIN_BOTTOM
+        plot_width = max(right - left, 1)
+
+        points = decimate(self.xs, self.ys, self.x_low, self.x_high, plot_width)
+        visible = [(x, y) for x, y in points if self.x_low <= x <= self.x_high]
+        max_revenue = max((y for _, y in visible), default=0) or 1
+        # Keep at least whole-rupee ticks when revenue is tiny
+        y_ticks = nice_ticks(0, max(max_revenue, 5))
+        y_high = max(y_ticks[-1], max_revenue)
+        x_ticks = [tick for tick in nice_ticks(self.x_low, self.x_high, max_ticks=max(plot_width // 90, 2))
+                   if tick == int(tick) and self.x_low <= tick <= self.x_high]
+
+        def to_x(value):
+            return left + (value - self.x_low) / (self.x_high - self.x_low) * plot_width
+
+        def to_y(value):
+            return bottom - value / y_high * (bottom - top)
+
+        # Grid lines
+        for tick in y_ticks:
+            canvas.create_line(left, to_y(tick), right, to_y(tick), fill="lightgray")
+        for tick in x_ticks:
+            canvas.create_line(to_x(tick), top, to_x(tick), bottom, fill="lightgray")
+
+        # The whole series is one polyline item
+        coords = []
+        for x, y in points:
+            coords.extend((to_x(x), to_y(y)))
+        if len(coords) >= 4:
+            canvas.create_line(*coords, fill="blue")
+        if len(visible) <= MAX_LABELLED_POINTS:
+            for x, y in visible:
+                px, py = to_x(x), to_y(y)
+                canvas.create_oval(px - 3, py - 3, px + 3, py + 3, fill="blue", outline="blue")
+                canvas.create_text(px, py - 10, text=f"रु{y:,.0f}", font=('Arial', 8), fill="black")
+
+        # Mask the line where it runs past the plot area, then draw the axes on top
+        canvas.create_rectangle(0, 0, left - 1, height, fill="white", outline="white")
+        canvas.create_rectangle(right + 1, 0, width, height, fill="white", outline="white")
+
+        canvas.create_text(width / 2, 25, text=self.title, font=('Arial', 14, 'bold'))
+        canvas.create_line(left, bottom, right, bottom, fill="black")  # X-axis
+        canvas.create_line(left, bottom, left, top, fill="black")      # Y-axis
+        for tick in y_ticks:
+            canvas.create_text(left - 8, to_y(tick), text=f"रु{tick:,.0f}", anchor="e", font=('Arial', 9))
+        for tick in x_ticks:
+            canvas.create_text(to_x(tick), bottom + 12, text=date.fromordinal(int(tick)).strftime('%b %d %Y'),
+                               font=('Arial', 9))
+
+        canvas.create_text(width / 2, height - 12, text="Days (scroll to zoom, drag to pan)", font=('Arial', 10))
+        canvas.create_text(15, (top + bottom) / 2, text="Revenue", font=('Arial', 12), angle=90)
+
+    def _on_wheel(self, event) -> None:
+        self._zoom(event.x, 0.8 if event.delta > 0 else 1.25)
+
+    def _zoom(self, pixel_x: int, factor: float) -> None:
+        width = max(self.canvas.winfo_width(), int(self.canvas.cget("width")))
+        plot_width = max(width - MARGIN_LEFT - MARGIN_RIGHT, 1)
+        fraction = min(max((pixel_x - MARGIN_LEFT) / plot_width, 0), 1)
+        anchor = self.x_low + fraction * (self.x_high - self.x_low)
+        span = max((self.x_high - self.x_low) * factor, 2)
+        self.x_low = anchor - fraction * span
+        self.x_high = self.x_low + span
+        self.draw()
+
+    def _on_press(self, event) -> None:
+        self.drag_start = (event.x, self.x_low, self.x_high)
+
+    def _on_drag(self, event) -> None:
+        if self.drag_start is None:
+            return
+        start_x, x_low, x_high = self.drag_start
+        width = max(self.canvas.winfo_width(), int(self.canvas.cget("width")))
+        plot_width = max(width - MARGIN_LEFT - MARGIN_RIGHT, 1)
+        shift = (start_x - event.x) / plot_width * (x_high - x_low)
+        self.x_low, self.x_high = x_low + shift, x_high + shift
+        self.draw()
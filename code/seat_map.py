@@ -0,0 +1,132 @@
+# Per-flight seat map.
+# Seats are bits of one Python int (1 = taken), numbered row by row with
+# one letter per seat in the row ("A1", "B1", ... "F1", "A2", ...). Finding
+# a free, preferred or adjacent seat is a handful of whole-bitmap bit
+# operations instead of a scan or a retry loop, so it stays fast however
+# full the flight is.
+from typing import Iterable, List, Optional
+
+CABIN_LETTERS = "ABCDEF"
+# Letters for each seat preference in a 3-3 cabin
+PREFERENCES = {
+    "window": "AF",
+    "middle": "BE",
+    "aisle": "CD",
+}
+
+
+class SeatMap:
+    def __init__(self, max_seats: int, taken: int = 0, letters: str = CABIN_LETTERS):
+        self.max_seats = max(int(max_seats), 0)
+        self.letters = letters
+        self.all_seats = (1 << self.max_seats) - 1
+        self.taken = taken & self.all_seats
+
+    @classmethod
+    def from_seats(cls, max_seats: int, occupied: int, seats: Iterable) -> "SeatMap":
+        """Rebuild a map from the seats of existing bookings.
+
+        Occupied seats without a usable label (old random seats that
+        collided, or seats taken without a booking) are filled in from the
+        back of the cabin, so the number of taken seats equals occupied.
+        """
+        seat_map = cls(max_seats)
+        occupied = min(max(int(occupied), 0), seat_map.max_seats)
+        for seat in seats:
+            if seat_map.free_count() == seat_map.max_seats - occupied:
+                break
+            index = seat_map.index(seat)
+            if index is not None:
+                seat_map.taken |= 1 << index
+        index = seat_map.max_seats - 1
+        while seat_map.taken_count() < occupied:
+            seat_map.taken |= 1 << index
+            index -= 1
+        return seat_map
+
+    @classmethod
+    def from_bytes(cls, max_seats: int, data: bytes) -> "SeatMap":
+        return cls(max_seats, int.from_bytes(data, "little"))
+
+    def to_bytes(self) -> bytes:
+        return self.taken.to_bytes((self.max_seats + 7) // 8, "little")
+
+    def index(self, seat) -> Optional[int]:
+        """Bit index of a seat label such as "C12", or None if not on this flight."""
+        seat = str(seat or "").strip().upper()
+        if len(seat) < 2 or seat[0] not in self.letters or not seat[1:].isdigit():
+            return None
+        index = (int(seat[1:]) - 1) * len(self.letters) + self.letters.index(seat[0])
+        return index if 0 <= index < self.max_seats else None
+
+    def label(self, index: int) -> str:
+        row, column = divmod(index, len(self.letters))
+        return f"{self.letters[column]}{row + 1}"
+
+    def taken_count(self) -> int:
+        return bin(self.taken).count("1")
+
+    def free_count(self) -> int:
+        return self.max_seats - self.taken_count()
+
+    def is_free(self, seat) -> bool:
+        index = self.index(seat)
+        return index is not None and not self.taken >> index & 1
+
+    def take(self, seat) -> str:
+        """Take a specific seat; raises ValueError if it is taken or invalid."""
+        index = self.index(seat)
+        if index is None:
+            raise ValueError(f"Seat {seat} does not exist on this flight")
+        if self.taken >> index & 1:
+            raise ValueError(f"Seat {seat} is already taken")
+        self.taken |= 1 << index
+        return self.label(index)
+
+    def release(self, seat) -> bool:
+        """Free a seat; returns False if it was not taken."""
+        index = self.index(seat)
+        if index is None or not self.taken >> index & 1:
+            return False
+        self.taken &= ~(1 << index)
+        return True
+
+    def allocate(self, preference: Optional[str] = None) -> Optional[str]:
+        """Take the first free seat, preferring the given kind (window,
+        middle or aisle) when one is free. Returns None if the flight is full."""
+        free = self.all_seats & ~self.taken
+        if preference in PREFERENCES:
+            preferred = free & self._column_mask(PREFERENCES[preference])
+            free = preferred or free
+        return self._take_lowest(free)
+
+    def allocate_adjacent(self, count: int) -> Optional[List[str]]:
+        """Take count side-by-side seats in one row, or return None."""
+        width = len(self.letters)
+        if not 1 <= count <= width:
+            return None
+        free = self.all_seats & ~self.taken
+        # Bit i of starts survives only if seats i .. i+count-1 are all free
+        starts = free & self._column_mask(self.letters[:width - count + 1])
+        for offset in range(1, count):
+            starts &= free >> offset
+        if not starts:
+            return None
+        first = (starts & -starts).bit_length() - 1
+        self.taken |= ((1 << count) - 1) << first
+        return [self.label(first + offset) for offset in range(count)]
+
+    def _take_lowest(self, free: int) -> Optional[str]:
+        if not free:
+            return None
+        index = (free & -free).bit_length() - 1
+        self.taken |= 1 << index
+        return self.label(index)
+
+    def _column_mask(self, letters: str) -> int:
+        # One row's pattern repeated over every row
+        width = len(self.letters)
+        row = sum(1 << self.letters.index(letter) for letter in letters)
+        rows = -(-self.max_seats // width)
+        repeat = ((1 << (width * rows)) - 1) // ((1 << width) - 1)
+        return row * repeat & self.all_seats
@@ -0,0 +1,200 @@
+# Synthetic flight catalogs and booking histories for benchmarks.
+# Rows look like the shipped workbooks: the same airlines and airports,
+# seat and price ranges, and Nepali names and addresses. Any size from
+# 10^3 to 10^7 rows can be produced. Each flight's bookings never exceed its
+# seats, seats are handed out in booking order as the store does, and
+# Occupied Seats matches the history. Generation is vectorised with NumPy.
+# The history comes out in chunks, so a 10M-row history is never held as
+# one DataFrame. The same seed always gives the same data.
+#
+# Usage: python synthetic_data.py --bookings N [--flights N] [--seed N] [--db FILE | --xlsx DIR]
+import argparse
+import os
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from booking_store import FLIGHT_COLUMNS, HISTORY_COLUMNS
+from history_stream import CHUNK_SIZE
+from seat_map import CABIN_LETTERS
+
+AIRLINES = {
+    "Buddha Air": "U4", "Himalaya Airlines": "H9", "Nepal Airlines": "RA", "Shree Airlines": "N9",
+    "Simrik Airlines": "RMK", "Summit Air": "SMA", "Tara Air": "TB", "Yeti Airlines": "YT",
+}
+ORIGINS = ["Bhairahwa", "Biratnagar", "Humla", "Janakpur", "Jomsom", "Jumla", "Kathmandu", "Lukla",
+           "Nepalgunj", "Pokhara", "Tikapur"]
+DESTINATIONS = ["Bangkok", "Bhadrapur", "Delhi", "Dhangadhi", "Dubai", "Humla", "Jomsom", "Jumla",
+                "Kathmandu", "Kuala Lumpur", "Lukla", "Mumbai", "Nepalgunj", "Pokhara", "Sagarmatha",
+                "Simra", "Singapore", "Surkhet", "Varanasi"]
+STATUSES = ["Ongoing", "Rescheduled", "Canceled"]
+STATUS_WEIGHTS = [0.8, 0.15, 0.05]
+FIRST_NAMES = ["Suman", "Anil", "Ramesh", "Priya", "Manish", "Sita", "Rajesh", "Gita", "Sunita", "Prakash",
+               "Kumar", "Anita", "Bikash", "Rina", "Nabin", "Kiran", "Deepa", "Suresh", "Asha", "Bishal"]
+LAST_NAMES = ["Sharma", "Singh", "Thapa", "Shrestha", "Joshi", "Rai", "Pradhan", "Pandey", "Gurung",
+              "Adhikari", "Lama", "Karki", "Khadka", "Dhakal", "Rijal", "Basnet", "Dhungana", "Giri"]
+ADDRESSES = ["Kalimati Road, Kalimati, Kathmandu", "Gurkha, 23, Pokhara", "Suryabinayak, 15, Bhaktapur",
+             "Krunas, 14, Lalitpur", "Rudranagar, 05, Patan", "Kohalpur, 12, Nepalgunj",
+             "Baneshwor, 10, Kathmandu", "Lakeside, 06, Pokhara", "Traffic Chowk, 04, Biratnagar"]
+
+SCHEDULE_START = 1704067200  # 2024-01-01 UTC
+SCHEDULE_DAYS = 365
+MAX_LEAD_DAYS = 60
+DAY = 24 * 3600
+# Bookings per user, on average
+BOOKINGS_PER_USER = 3
+
+
+def default_flights(bookings: int) -> int:
+    """A catalog size that leaves flights about half full."""
+    return max(1000, bookings // 100)
+
+
+class SyntheticData:
+    """A generated catalog (flights) and the history that goes with it.
+
+    Only one int array per booking column is kept in memory; the
+    DataFrames are built chunk by chunk by iter_history().
+    """
+
+    def __init__(self, bookings: int, flights: Optional[int] = None, seed: int = 0):
+        flights = flights or default_flights(bookings)
+        self.bookings = bookings
+        rng = np.random.default_rng(seed)
+        self.flights = _make_flights(rng, flights)
+
+        max_seats = self.flights["Max Seats"].to_numpy()
+        if bookings > max_seats.sum():
+            raise ValueError(f"{bookings} bookings do not fit in {flights} flights; use more flights")
+        counts = _bookings_per_flight(rng, max_seats, bookings)
+        self.flights["Occupied Seats"] = counts
+
+        # One entry per booking, in booking date order
+        flight_index = np.repeat(np.arange(flights, dtype=np.int32), counts)
+        lead = rng.integers(3600, MAX_LEAD_DAYS * DAY, bookings)
+        booked_at = self.flights["Scheduled Time"].to_numpy()[flight_index] - lead
+        order = np.argsort(booked_at, kind="stable")
+        self.flight_index = flight_index[order]
+        self.booked_at = booked_at[order]
+        self.seat_index = _seat_numbers(self.flight_index, flights)
+        users = max(bookings // BOOKINGS_PER_USER, 1)
+        self.user = rng.integers(0, users, bookings).astype(np.int32)
+
+    def iter_history(self, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """The history in booking order, as DataFrames of chunk_size rows."""
+        for start in range(0, self.bookings, chunk_size):
+            yield self._history_chunk(slice(start, start + chunk_size))
+
+    def history(self) -> pd.DataFrame:
+        if not self.bookings:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        return self._history_chunk(slice(0, self.bookings))
+
+    def sample_user(self, i: int = 0) -> dict:
+        """Name, phone and ID of one booking's user, e.g. for search terms."""
+        row = self._history_chunk(slice(i, i + 1)).iloc[0]
+        return {field: str(row[field]) for field in ["User Name", "User Phone", "User ID"]}
+
+    def _history_chunk(self, rows: slice) -> pd.DataFrame:
+        flights = self.flights.iloc[self.flight_index[rows]].reset_index(drop=True)
+        seats = self.seat_index[rows]
+        user = self.user[rows]
+        letters = np.array(list(CABIN_LETTERS))
+        first = np.array(FIRST_NAMES)[user % len(FIRST_NAMES)]
+        last = np.array(LAST_NAMES)[user // len(FIRST_NAMES) % len(LAST_NAMES)]
+        return pd.DataFrame({
+            "Booking Date": _format_epoch(self.booked_at[rows]),
+            "Airline Name": flights["Airline Name"],
+            "Flight ID": flights["Flight ID"],
+            "From Destination": flights["From Destination"],
+            "To Destination": flights["To Destination"],
+            "Scheduled Time": _format_epoch(flights["Scheduled Time"].to_numpy()),
+            "Price": flights["Price"],
+            "Seat": pd.Series(letters[seats % len(letters)]) + pd.Series(seats // len(letters) + 1).astype(str),
+            "User Name": pd.Series(first) + " " + pd.Series(last),
+            "User Address": np.array(ADDRESSES)[user % len(ADDRESSES)],
+            "User Phone": 9800000000 + user.astype(np.int64) * 7919 % 100_000_000,
+            "User ID": "U-" + pd.Series(user).astype(str).str.zfill(7),
+        }, columns=HISTORY_COLUMNS)
+
+
+def _make_flights(rng: np.random.Generator, count: int) -> pd.DataFrame:
+    airlines = np.array(list(AIRLINES))
+    airline = rng.integers(0, len(airlines), count)
+    origin = np.array(ORIGINS)[rng.integers(0, len(ORIGINS), count)]
+    destination = np.array(DESTINATIONS)[rng.integers(0, len(DESTINATIONS), count)]
+    # A flight never lands where it took off: send those to Kathmandu, or
+    # from Kathmandu to Pokhara
+    same = origin == destination
+    destination[same] = np.where(origin[same] == "Kathmandu", "Pokhara", "Kathmandu")
+    # Departures on the hour or half hour over one year
+    departures = SCHEDULE_START + rng.integers(0, SCHEDULE_DAYS * 48, count) * 1800
+    codes = np.array(list(AIRLINES.values()))[airline]
+    return pd.DataFrame({
+        "Airline Name": airlines[airline],
+        "Flight ID": pd.Series(codes) + pd.Series(np.arange(count)).astype(str).str.zfill(6),
+        "From Destination": origin,
+        "To Destination": destination,
+        "Scheduled Time": departures,
+        "Status": rng.choice(STATUSES, count, p=STATUS_WEIGHTS),
+        "Max Seats": rng.integers(29, 45, count) * 5,  # 145 to 220, as in flights.xlsx
+        "Occupied Seats": 0,
+        "Price": rng.integers(64, 112, count) * 50,  # 3200 to 5550
+    }, columns=FLIGHT_COLUMNS)
+
+
+def _bookings_per_flight(rng: np.random.Generator, max_seats: np.ndarray, bookings: int) -> np.ndarray:
+    # Popular flights fill up, quiet ones stay mostly empty
+    weights = rng.beta(2, 2, len(max_seats)) * max_seats
+    counts = np.minimum(np.floor(weights / weights.sum() * bookings).astype(np.int64), max_seats)
+    # Hand out what rounding and full flights left over, one seat at a time
+    while (remaining := bookings - int(counts.sum())) > 0:
+        spare = np.flatnonzero(counts < max_seats)[:remaining]
+        counts[spare] += 1
+    return counts
+
+
+def _seat_numbers(flight_index: np.ndarray, flights: int) -> np.ndarray:
+    # Each booking takes the flight's next seat: its rank among the bookings
+    # for that flight, in booking order
+    order = np.argsort(flight_index, kind="stable")
+    starts = np.zeros(flights + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flight_index, minlength=flights), out=starts[1:])
+    ranks = np.empty(len(flight_index), dtype=np.int64)
+    ranks[order] = np.arange(len(flight_index)) - starts[flight_index[order]]
+    return ranks
+
+
+def _format_epoch(seconds: np.ndarray) -> pd.Series:
+    return pd.Series(pd.to_datetime(seconds, unit='s').strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic flights and bookings")
+    parser.add_argument("--bookings", type=int, required=True)
+    parser.add_argument("--flights", type=int, help="default: enough to leave flights about half full")
+    parser.add_argument("--seed", type=int, default=0)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--db", help="load into this SQLite store (replacing its contents)")
+    target.add_argument("--xlsx", metavar="DIR", help="write flights.xlsx and flight_history.xlsx into DIR")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = SyntheticData(args.bookings, args.flights, args.seed)
+    if args.db:
+        from booking_store import SQLiteBookingStore
+        store = SQLiteBookingStore(args.db)
+        store.replace_contents(data.flights, data.iter_history())
+        store.close()
+    else:
+        os.makedirs(args.xlsx, exist_ok=True)
+        data.flights.to_excel(os.path.join(args.xlsx, "flights.xlsx"), index=False)
+        # Excel sheets stop at 1,048,576 rows; to_excel raises beyond that
+        data.history().to_excel(os.path.join(args.xlsx, "flight_history.xlsx"), index=False)
+    print(f"{len(data.flights)} flights, {data.bookings} bookings in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
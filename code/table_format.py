@@ -0,0 +1,42 @@
+# Column-at-a-time formatting for the flights and history tables.
+# Timestamps are converted and formatted as whole columns, and the result
+# is handed to the Treeview as plain row tuples.
+from typing import List, Tuple
+
+import pandas as pd
+
+from booking_store import FLIGHT_COLUMNS, HISTORY_COLUMNS
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def format_epoch_column(column: pd.Series) -> pd.Series:
+    """Format a column of Unix timestamps (seconds)."""
+    return pd.to_datetime(column, unit='s').dt.strftime(DATE_FORMAT)
+
+
+def format_date_column(column: pd.Series) -> pd.Series:
+    """Format a column of date strings or datetimes; unparseable values are kept."""
+    parsed = pd.to_datetime(column, errors='coerce', format='mixed')
+    return parsed.dt.strftime(DATE_FORMAT).where(parsed.notna(), column.astype(str))
+
+
+def format_flight_rows(df: pd.DataFrame) -> List[Tuple]:
+    if df.empty:
+        return []
+    df = df[FLIGHT_COLUMNS].copy()
+    df["Scheduled Time"] = format_epoch_column(df["Scheduled Time"])
+    return list(df.itertuples(index=False, name=None))
+
+
+def format_history_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.reindex(columns=HISTORY_COLUMNS)
+    if df.empty:
+        return df
+    df["Booking Date"] = format_date_column(df["Booking Date"])
+    df["Scheduled Time"] = format_date_column(df["Scheduled Time"])
+    return df
+
+
+def format_history_rows(df: pd.DataFrame) -> List[Tuple]:
+    return list(format_history_frame(df).itertuples(index=False, name=None))
@@ -0,0 +1,119 @@
+# Timing spans and profiling for the app.
+# Off by default, when span() costs one global check. enable_tracing()
+# records every span as a Chrome trace event and writes them to a JSON file
+# at exit; load it in chrome://tracing or ui.perfetto.dev to see one
+# timeline per thread (the Tk thread and each background worker).
+# enable_profiling() runs cProfile in every thread and saves the merged
+# stats at exit, for `python -m pstats FILE` or snakeviz.
+import atexit
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+_lock = threading.Lock()
+_events: Optional[List[Dict]] = None  # None while tracing is off
+_thread_names: Dict[int, str] = {}
+_profilers: List[cProfile.Profile] = []
+_start_ns = time.perf_counter_ns()
+
+
+def enable_tracing(path: str) -> None:
+    """Record spans from now on and write them to path when the app exits."""
+    global _events
+    if _events is None:
+        _events = []
+        atexit.register(write_trace, path)
+
+
+def tracing_enabled() -> bool:
+    return _events is not None
+
+
+@contextmanager
+def span(name: str, **args):
+    """Time the with block as one trace event; args are shown with it."""
+    if _events is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _record(name, start, time.perf_counter_ns(), args)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator: run the function inside span(name or its own name)."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def write_trace(path: str) -> None:
+    """Write the spans recorded so far in Chrome trace event format."""
+    with _lock:
+        events = list(_events or [])
+        names = dict(_thread_names)
+    pid = os.getpid()
+    # Metadata events name each thread's row in the viewer
+    metadata = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+                for tid, thread_name in names.items()]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+
+
+def enable_profiling(path: str) -> None:
+    """Profile every thread from now on and save the stats to path at exit."""
+    profiler = cProfile.Profile()
+    _profilers.append(profiler)
+    if sys.version_info < (3, 12):
+        # cProfile hooks only the thread that enables it, so each new thread
+        # (the background workers) starts its own profiler
+        threading.setprofile(_profile_thread)
+    # From 3.12 cProfile uses sys.monitoring, which already sees every thread
+    profiler.enable()
+    atexit.register(_save_profile, path)
+
+
+def _record(name: str, start: int, end: int, args: Dict) -> None:
+    thread = threading.current_thread()
+    event = {
+        "name": name, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+        # Chrome traces count in microseconds
+        "ts": (start - _start_ns) // 1000, "dur": (end - start) // 1000,
+    }
+    if args:
+        event["args"] = args
+    with _lock:
+        if _events is not None:
+            _events.append(event)
+            _thread_names[thread.ident] = thread.name
+
+
+def _profile_thread(*_) -> None:
+    # Called on the first event in a new thread; enabling the profiler
+    # replaces this hook with cProfile's own
+    profiler = cProfile.Profile()
+    with _lock:
+        _profilers.append(profiler)
+    profiler.enable()
+
+
+def _save_profile(path: str) -> None:
+    # Worker threads have been joined by now, so their profilers are idle
+    _profilers[0].disable()
+    stats = pstats.Stats(*_profilers)
+    stats.dump_stats(path)
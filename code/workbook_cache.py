@@ -0,0 +1,78 @@
+# Cached workbook loader.
+# Parsing .xlsx with openpyxl is slow, so each parsed workbook is kept in
+# memory and pickled next to the file. The workbook is only parsed again
+# when its modification time or size no longer match the snapshot, i.e.
+# when it was changed outside the app.
+import os
+import pickle
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from tracing import span
+
+Signature = Tuple[int, int]
+
+_memory_cache: Dict[str, Tuple[Signature, pd.DataFrame]] = {}
+
+
+def file_signature(path: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def snapshot_path(path: str) -> str:
+    return path + ".cache.pkl"
+
+
+def read_workbook(path: str) -> pd.DataFrame:
+    """pd.read_excel(path), served from the snapshot when it is current."""
+    signature = file_signature(path)
+    if signature is None:
+        raise FileNotFoundError(path)
+
+    cached = _memory_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1].copy()
+
+    try:
+        with open(snapshot_path(path), "rb") as f:
+            snapshot_signature, df = pickle.load(f)
+        if snapshot_signature == signature:
+            _memory_cache[path] = (signature, df)
+            return df.copy()
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    with span("read_excel", path=os.path.basename(path)):
+        df = pd.read_excel(path)
+    _save_snapshot(path, signature, df)
+    return df.copy()
+
+
+def write_workbook(df: pd.DataFrame, path: str) -> None:
+    """df.to_excel(path), refreshing the snapshot so it is not reparsed.
+
+    The workbook is written next to the target and renamed over it, so a
+    crash mid-write never leaves a truncated file behind.
+    """
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.tmp{ext}"  # pandas picks the writer from the extension
+    with span("to_excel", path=os.path.basename(path), rows=len(df)):
+        df.to_excel(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    _save_snapshot(path, file_signature(path), df.reset_index(drop=True))
+
+
+def _save_snapshot(path: str, signature: Signature, df: pd.DataFrame) -> None:
+    _memory_cache[path] = (signature, df)
+    try:
+        tmp_path = snapshot_path(path) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((signature, df), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path(path))
+    except OSError as e:
+        print(f"Warning: could not write workbook snapshot for {path}: {e}")